@@ -4,13 +4,25 @@ This module implements an agent that uses the OpenRouter API for LLM inference,
 supporting streaming responses, tool calling, and reasoning token display.
 """
 
+import asyncio
+import contextlib
 import json
-from collections.abc import Callable, Iterator
-from dataclasses import dataclass, field
+import threading
+from collections.abc import AsyncGenerator, Callable, Generator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from enum import Enum, auto
 from typing import Any
 
-from framework.llm import OpenRouterClient, OpenRouterConfig, TokenUsage
+from framework.llm import (
+    OpenRouterClient,
+    OpenRouterConfig,
+    StreamChunk,
+    TokenUsage,
+    cache_control_content,
+    close_shared_client,
+)
+from framework.llm_cache import LLMCache
 from framework.verifier import Verifier
 
 # Prefix that indicates the agent should stop (answer was submitted)
@@ -19,6 +31,9 @@ ANSWER_SUBMITTED_PREFIX = "ANSWER_SUBMITTED:"
 
 type ToolFunction = Callable[..., str]
 
+# Marks the end of the event stream handed from the worker thread to run_async
+_STREAM_END = object()
+
 
 class EventType(Enum):
     """Types of events emitted during agent execution."""
@@ -107,6 +122,7 @@ class Conversation:
     def to_api_format(
         self,
         compression: ContextCompressionSettings | None = None,
+        cache_prefix: bool = False,
     ) -> list[dict[str, Any]]:
         """Convert the conversation to OpenAI-compatible API format.
 
@@ -114,6 +130,11 @@ class Conversation:
             compression: Optional compression settings. If enabled, older tool
                 results are truncated and duplicate consecutive tool calls are
                 deduplicated.
+            cache_prefix: If True, system messages (the prefix shared by every
+                conversation, including after a reset) and the latest user
+                message carry cache_control breakpoints, so the provider can
+                reuse the shared prefix and the history up to the current turn
+                and only prefill the tokens after it.
         """
         messages_to_convert = self.messages
 
@@ -124,12 +145,24 @@ class Conversation:
                 max_chars=compression.max_chars,
             )
 
+        # Rolling breakpoint: the latest user message marks where this turn
+        # diverges from what the provider has already cached
+        last_user_idx = -1
+        if cache_prefix:
+            for idx in range(len(messages_to_convert) - 1, -1, -1):
+                if messages_to_convert[idx].role == "user":
+                    last_user_idx = idx
+                    break
+
         result: list[dict[str, Any]] = []
-        for message in messages_to_convert:
+        for idx, message in enumerate(messages_to_convert):
             msg: dict[str, Any] = {"role": message.role}
 
             if message.content is not None:
-                msg["content"] = message.content
+                if cache_prefix and (message.role == "system" or idx == last_user_idx):
+                    msg["content"] = cache_control_content(message.content)
+                else:
+                    msg["content"] = message.content
 
             if message.tool_calls is not None:
                 msg["tool_calls"] = message.tool_calls
@@ -242,13 +275,27 @@ class Agent:
     # Max times the verifier can reject before we let submit_answer through
     MAX_VERIFY_REJECTIONS = 1
 
-    def __init__(self, config: OpenRouterConfig, tools: dict[str, Tool]):
+    def __init__(
+        self,
+        config: OpenRouterConfig,
+        tools: dict[str, Tool],
+        cache: LLMCache | None = None,
+        tool_concurrency_limit: int = 1,
+    ):
         self.config = config
         self.tools: dict[str, Tool] = tools  # mapping from tool name to tool object
         self.client: OpenRouterClient = OpenRouterClient(config)
+        # Optional response cache; only consulted for deterministic requests
+        self.cache = cache
+        # Max tool calls from a single response executed in parallel
+        # (1 = sequential). Tools are blocking, so they run on a thread pool.
+        self.tool_concurrency_limit = tool_concurrency_limit
+        self._tool_pool: ThreadPoolExecutor | None = None
         self.conversation: Conversation = Conversation()
+        # Compression rewrites older messages, which would invalidate the
+        # provider's cached prefix on every turn
         self._compression = ContextCompressionSettings(
-            enabled=config.compress_context,
+            enabled=config.compress_context and not config.cache_friendly_memory,
             keep_recent=config.compress_keep_recent,
             max_chars=config.compress_max_chars,
         )
@@ -260,6 +307,9 @@ class Agent:
         )
         self._verify_rejections = 0
         self._original_prompt = ""
+        # Serialises runs so an abandoned run_async worker cannot interleave
+        # with the next turn's conversation updates
+        self._run_lock = threading.Lock()
 
         # Initialise the business-rules guide validator (Stage 3)
         from tools.business_rules import init_guide_validator
@@ -332,6 +382,27 @@ class Agent:
         except Exception as e:
             return f"Error executing {tool_call.name}: {e}"
 
+    def _can_run_tools_concurrently(self, tool_calls: list[ToolCall]) -> bool:
+        """Whether a batch of tool calls can be dispatched in parallel.
+
+        ``submit_answer`` ends the run and goes through the stateful
+        verification gate, so batches containing it stay sequential.
+        """
+        return (
+            self.tool_concurrency_limit > 1
+            and len(tool_calls) > 1
+            and all(tc.name != "submit_answer" for tc in tool_calls)
+        )
+
+    def _get_tool_pool(self) -> ThreadPoolExecutor:
+        """Lazily create the thread pool used for concurrent tool calls."""
+        if self._tool_pool is None:
+            self._tool_pool = ThreadPoolExecutor(
+                max_workers=self.tool_concurrency_limit,
+                thread_name_prefix="agent-tool",
+            )
+        return self._tool_pool
+
     # -----------------------------------------------------------------
     # Verification helpers
     # -----------------------------------------------------------------
@@ -376,11 +447,43 @@ class Agent:
                 break
         return ""
 
+    def _stream_completion(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+    ) -> Iterator[StreamChunk]:
+        """Stream completion chunks, replaying a cached response on a hit.
+
+        Only requests with ``temperature == 0`` are cached, since sampled
+        responses are not reproducible anyway. A response is stored only
+        once its stream has been fully consumed.
+        """
+        if self.cache is None or self.config.temperature != 0:
+            yield from self.client.chat_completion_stream(messages, tools)
+            return
+
+        key = LLMCache.make_key(self.config.model, messages, tools)
+        cached: list[StreamChunk] | None = self.cache.get(key)
+        if cached is not None:
+            # Replayed responses cost no tokens
+            for chunk in cached:
+                yield replace(chunk, usage=None)
+            return
+
+        recorded: list[StreamChunk] = []
+        for chunk in self.client.chat_completion_stream(messages, tools):
+            recorded.append(chunk)
+            yield chunk
+        self.cache.set(key, recorded)
+
     def _generate_response(self, conversation: Conversation) -> Iterator[AgentEvent]:
         """Generate a response from the model, streaming the events out."""
         yield AgentEvent(type=EventType.GENERATION_START)
 
-        messages = conversation.to_api_format(compression=self._compression)
+        messages = conversation.to_api_format(
+            compression=self._compression,
+            cache_prefix=self.config.cache_friendly_memory,
+        )
         tools = self._get_tool_definitions() if self.tools else None
 
         full_content = ""
@@ -389,7 +492,7 @@ class Agent:
         finish_reason: str | None = None
         usage: TokenUsage | None = None
 
-        for chunk in self.client.chat_completion_stream(messages, tools):
+        for chunk in self._stream_completion(messages, tools):
             # Handle reasoning/thinking tokens
             if chunk.reasoning_details:
                 for detail in chunk.reasoning_details:
@@ -703,7 +806,7 @@ class Agent:
             "Step 5: submit_answer(query=\"SELECT category, ...\")\n"
         )
 
-    def run(self, prompt: str) -> Iterator[AgentEvent]:
+    def run(self, prompt: str) -> Generator[AgentEvent]:
         """Run the agent with streaming output, from the user's natural language prompt.
 
         Pre-submission verification is handled inside ``_execute_tool``:
@@ -799,16 +902,34 @@ class Agent:
                 )
             )
 
+            # Independent tool calls are dispatched together; results are
+            # still reported and recorded in the order the model issued them
+            concurrent = self._can_run_tools_concurrently(tool_calls)
+            if concurrent:
+                for tool_call in tool_calls:
+                    yield AgentEvent(
+                        type=EventType.TOOL_CALL_PARSED,
+                        data={"name": tool_call.name, "arguments": tool_call.arguments},
+                    )
+                    yield AgentEvent(
+                        type=EventType.TOOL_EXECUTION_START,
+                        data={"name": tool_call.name},
+                    )
+                concurrent_results = self._get_tool_pool().map(self._execute_tool, tool_calls)
+
             for tool_call in tool_calls:
-                yield AgentEvent(
-                    type=EventType.TOOL_CALL_PARSED,
-                    data={"name": tool_call.name, "arguments": tool_call.arguments},
-                )
-                yield AgentEvent(
-                    type=EventType.TOOL_EXECUTION_START,
-                    data={"name": tool_call.name},
-                )
-                tool_result = self._execute_tool(tool_call)
+                if concurrent:
+                    tool_result = next(concurrent_results)
+                else:
+                    yield AgentEvent(
+                        type=EventType.TOOL_CALL_PARSED,
+                        data={"name": tool_call.name, "arguments": tool_call.arguments},
+                    )
+                    yield AgentEvent(
+                        type=EventType.TOOL_EXECUTION_START,
+                        data={"name": tool_call.name},
+                    )
+                    tool_result = self._execute_tool(tool_call)
                 yield AgentEvent(
                     type=EventType.TOOL_EXECUTION_END,
                     data={"name": tool_call.name, "result": tool_result},
@@ -842,6 +963,62 @@ class Agent:
             data={"error": "Max iterations reached", "usage": total_usage},
         )
 
+    async def run_async(self, prompt: str) -> AsyncGenerator[AgentEvent]:
+        """Async variant of ``run`` for callers driven by an event loop.
+
+        The blocking LLM stream and tool calls execute on a worker thread and
+        events are handed back to the loop as they are produced, so the loop
+        stays free for input and signal handling during a turn. Closing or
+        cancelling the consumer stops the worker at the next event boundary.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[Any] = asyncio.Queue()
+        stop = threading.Event()
+
+        def emit(item: Any) -> None:
+            # The loop may already be closed if the consumer went away
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+
+        def produce() -> None:
+            with self._run_lock:
+                events = self.run(prompt)
+                try:
+                    for event in events:
+                        if stop.is_set():
+                            break
+                        emit(event)
+                finally:
+                    events.close()
+                    emit(_STREAM_END)
+
+        worker = asyncio.ensure_future(asyncio.to_thread(produce))
+        try:
+            while (item := await queue.get()) is not _STREAM_END:
+                yield item
+        finally:
+            stop.set()
+        # Surface exceptions raised inside run()
+        await worker
+
+    def update_conversation(self, update: Callable[[Conversation], bool]) -> bool:
+        """Apply *update* to the conversation while no run is in progress.
+
+        Holds the run lock, so an update still running on a worker thread
+        (e.g. after its awaiting caller was cancelled) finishes before the
+        next turn touches the history.
+        """
+        with self._run_lock:
+            return update(self.conversation)
+
+    def close(self) -> None:
+        """Release HTTP connections and worker threads held by the agent."""
+        self.client.close()
+        close_shared_client()
+        if self._tool_pool is not None:
+            self._tool_pool.shutdown(wait=False)
+            self._tool_pool = None
+
     def reset_conversation(self) -> None:
         """Reset the conversation to the initial state (with system message)."""
         self.conversation = Conversation()
@@ -923,6 +1100,7 @@ def _looks_like_malformed_tool_call_text(
     arg_like_keys = {
         "query", "question", "sql", "schema_name", "table_name", "search_term",
         "keyword", "business_rules", "schema_info", "previous_sql", "error_message",
+        "job_id",
     }
     if keys and keys.issubset(arg_like_keys):
         return True
@@ -14,12 +14,16 @@ from pathlib import Path
 
 import duckdb
 import polars as pl
+import pyarrow as pa
 import sqlglot
 from sqlglot.errors import ParseError
 
 # Path to the consolidated database file
 DATABASE_PATH = Path(__file__).parent.parent / "hecks.duckdb"
 
+# Rows per Arrow batch when streaming results for a preview
+PREVIEW_BATCH_ROWS = 8192
+
 @dataclass
 class QueryValidationResult:
     """Result of SQL query validation."""
@@ -100,6 +104,106 @@ def execute_query(query: str) -> QueryExecutionResult:
         conn.close()
 
 
+@dataclass
+class QueryPreviewResult:
+    """Result of executing a SQL query for display.
+
+    Attributes:
+        dataframe: The first rows of the results as a Polars DataFrame, or None if error.
+        total_rows: Total number of rows the query returned.
+        error_message: Error message if execution failed, None otherwise.
+    """
+
+    dataframe: pl.DataFrame | None
+    total_rows: int = 0
+    error_message: str | None = None
+
+    @property
+    def is_success(self) -> bool:
+        """Return True if the query executed successfully."""
+        return self.error_message is None
+
+
+def execute_query_preview(query: str, max_rows: int) -> QueryPreviewResult:
+    """Execute a SQL query, keeping only the first ``max_rows`` rows in memory.
+
+    Results are streamed from DuckDB in Arrow record batches; rows past the
+    preview are counted and dropped, so a large result set is never
+    materialized as a whole.
+
+    Args:
+        query: SQL query string with schema-qualified table names.
+        max_rows: Number of leading rows to keep.
+
+    Returns:
+        QueryPreviewResult with the leading rows and the total row count, or
+        an error message describing what went wrong.
+    """
+    conn = None
+    try:
+        conn = duckdb.connect(str(DATABASE_PATH), read_only=True)
+        reader = conn.execute(query).fetch_record_batch(PREVIEW_BATCH_ROWS)
+        batches: list[pa.RecordBatch] = []
+        kept = 0
+        total_rows = 0
+        for batch in reader:
+            total_rows += batch.num_rows
+            if kept < max_rows:
+                head = batch.slice(0, max_rows - kept)
+                batches.append(head)
+                kept += head.num_rows
+        table = pa.Table.from_batches(batches, schema=reader.schema)
+        return QueryPreviewResult(dataframe=pl.DataFrame(table), total_rows=total_rows)
+    except duckdb.Error as e:
+        return QueryPreviewResult(dataframe=None, error_message=f"DuckDB error: {e}")
+    except Exception as e:
+        return QueryPreviewResult(dataframe=None, error_message=str(e))
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+def _display_strings(series: pl.Series) -> pl.Series:
+    """Render a column as display strings, with nulls shown as NULL.
+
+    Values match Python's ``str()``. Types whose polars string cast already
+    agrees with it (integers, strings, dates, decimals) and datetimes are
+    converted natively; everything else goes through ``str()``.
+    """
+    dtype = series.dtype
+    if dtype == pl.Boolean:
+        strings = series.replace_strict({True: "True", False: "False"}, return_dtype=pl.Utf8)
+    elif isinstance(dtype, pl.Datetime):
+        # Python datetimes have microsecond precision and omit a zero fraction
+        strings = (
+            series.dt.cast_time_unit("us")
+            .cast(pl.Utf8)
+            .str.replace(".000000", "", literal=True)
+        )
+    elif dtype.is_integer() or isinstance(
+        dtype, (pl.String, pl.Date, pl.Decimal, pl.Categorical, pl.Enum)
+    ):
+        strings = series.cast(pl.Utf8)
+    else:
+        # Floats (repr-style exponents, nan), times, durations, nested and
+        # binary values have no matching native cast; fall back to Python
+        strings = pl.Series(
+            series.name,
+            [str(v) if v is not None else None for v in series.to_list()],
+            dtype=pl.Utf8,
+        )
+    return strings.fill_null("NULL")
+
+
+def format_rows(df: pl.DataFrame) -> list[str]:
+    """Render each row as ``v1 | v2 | ...`` with vectorized string ops.
+
+    Values print as ``str()`` would print them, with nulls shown as NULL.
+    """
+    display = pl.DataFrame([_display_strings(s) for s in df.get_columns()])
+    return display.select(pl.concat_str(pl.all(), separator=" | "))[:, 0].to_list()
+
+
 # Helper functions for listing schemas and tables
 # You can use these to make a tool if you like!
 
@@ -150,6 +254,38 @@ def list_tables(schema_name: str) -> list[str] | None:
     finally:
         conn.close()
 
+def list_tables_by_schema() -> dict[str, list[str]]:
+    """List every schema with its tables in a single query.
+
+    Equivalent to calling ``list_tables`` for each schema from
+    ``list_schemas``, without a round-trip per schema.
+
+    Returns:
+        Mapping of schema name to its sorted base-table names, in schema
+        order. Schemas that only contain views map to an empty list.
+    """
+    conn = None
+    try:
+        conn = duckdb.connect(str(DATABASE_PATH), read_only=True)
+        result = conn.execute("""
+            SELECT table_schema, table_name, table_type = 'BASE TABLE'
+            FROM information_schema.tables
+            WHERE table_schema NOT IN ('information_schema', 'pg_catalog')
+            ORDER BY table_schema, table_name
+        """).fetchall()
+    except Exception:
+        return {}
+    finally:
+        if conn is not None:
+            conn.close()
+
+    tables_by_schema: dict[str, list[str]] = {}
+    for schema_name, table_name, is_base_table in result:
+        tables = tables_by_schema.setdefault(schema_name, [])
+        if is_base_table:
+            tables.append(table_name)
+    return tables_by_schema
+
 def describe_table(schema_name: str, table_name: str) -> list[str]:
     """Describe a table's columns with their types.
 
@@ -6,6 +6,7 @@ streaming chat completions with tool calling.
 
 import json
 import logging
+import threading
 from collections.abc import Iterator
 from dataclasses import dataclass, field
 from typing import Any
@@ -71,6 +72,19 @@ class OpenRouterConfig:
     compress_context: bool = False  # Enable context compression
     compress_keep_recent: int = 3  # Number of recent tool results to keep in full
     compress_max_chars: int = 150  # Max chars for truncated older results
+    # Prompt-cache friendly history: keep earlier messages byte-identical across
+    # requests (disables compression) and mark the static system prefix with a
+    # cache_control breakpoint so providers can reuse it between turns
+    cache_friendly_memory: bool = False
+
+
+def cache_control_content(text: str) -> list[dict[str, Any]]:
+    """Wrap text as a content part carrying an ephemeral prompt-cache breakpoint.
+
+    Providers with prompt caching (e.g. Anthropic via OpenRouter) cache the
+    request prefix up to and including this part; others ignore the marker.
+    """
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
 
 
 @dataclass
@@ -279,11 +293,40 @@ class OpenRouterClient:
         self._client.close()
 
 
+# Connection pool shared by all completion_request calls (NL2SQL, verifier,
+# guide validator), so repeated calls reuse keep-alive connections instead
+# of paying a TCP/TLS handshake each time
+_shared_client: httpx.Client | None = None
+_shared_client_lock = threading.Lock()
+
+
+def _get_shared_client() -> httpx.Client:
+    """Return the shared HTTP client for non-streaming requests, creating it once."""
+    global _shared_client  # noqa: PLW0603
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = httpx.Client(
+                timeout=60.0,
+                limits=httpx.Limits(max_keepalive_connections=16),
+            )
+        return _shared_client
+
+
+def close_shared_client() -> None:
+    """Close the shared HTTP client (it is recreated on next use)."""
+    global _shared_client  # noqa: PLW0603
+    with _shared_client_lock:
+        if _shared_client is not None:
+            _shared_client.close()
+            _shared_client = None
+
+
 def completion_request(
     api_key: str,
     model: str,
     messages: list[dict[str, Any]],
     temperature: float = 0.2,
+    response_format: dict[str, Any] | None = None,
 ) -> str:
     """Make a non-streaming chat completion request.
 
@@ -294,6 +337,9 @@ def completion_request(
         model: Model ID (e.g. anthropic/claude-opus-4.6).
         messages: Chat messages in OpenAI format.
         temperature: Sampling temperature.
+        response_format: Optional OpenAI-style response format (e.g. a
+            ``json_schema`` for structured output). Providers without
+            structured-output support ignore it.
 
     Returns:
         The assistant message content as a string.
@@ -301,25 +347,29 @@ def completion_request(
     Raises:
         httpx.HTTPStatusError: On API errors.
     """
-    with httpx.Client(timeout=60.0) as client:
-        resp = client.post(
-            OPENROUTER_API_URL,
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": "https://github.com/hex-inc/takehome",
-                "X-Title": "Hex Takehome Agent",
-            },
-            json={
-                "model": model,
-                "messages": messages,
-                "max_tokens": 4096,
-                "temperature": temperature,
-                "stream": False,
-            },
-        )
-        resp.raise_for_status()
-        data = resp.json()
+    body: dict[str, Any] = {
+        "model": model,
+        "messages": messages,
+        "max_tokens": 4096,
+        "temperature": temperature,
+        "stream": False,
+    }
+    if response_format is not None:
+        body["response_format"] = response_format
+
+    client = _get_shared_client()
+    resp = client.post(
+        OPENROUTER_API_URL,
+        headers={
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://github.com/hex-inc/takehome",
+            "X-Title": "Hex Takehome Agent",
+        },
+        json=body,
+    )
+    resp.raise_for_status()
+    data = resp.json()
     choices = data.get("choices", [])
     if not choices:
         raise RuntimeError("No choices in completion response")
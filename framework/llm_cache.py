@@ -0,0 +1,180 @@
+"""Response cache for deterministic LLM calls.
+
+Entries are keyed on a SHA-256 digest of the model, messages, and tool
+schemas, so any change to the prompt (including the system prompt or the
+tool set) is a miss. Storage is delegated to a ``CacheBackend``: the default
+is an in-memory LRU with per-entry expiry, and ``DiskCacheBackend`` persists
+entries across processes.
+
+Example:
+    >>> cache = LLMCache()
+    >>> key = LLMCache.make_key("some/model", messages, tools)
+    >>> if (response := cache.get(key)) is None:
+    ...     response = call_model(messages, tools)
+    ...     cache.set(key, response)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Protocol
+
+# Default location for DiskCacheBackend
+DEFAULT_DISK_CACHE_DIR = Path("~/.cache/agent_repl")
+
+
+class CacheBackend(Protocol):
+    """Storage protocol used by ``LLMCache``."""
+
+    def get(self, key: str) -> Any | None:
+        """Return the stored value, or None if missing or expired."""
+        ...
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store a value, expiring after ``ttl`` seconds if given."""
+        ...
+
+    def delete(self, key: str) -> None:
+        """Remove a value if present."""
+        ...
+
+    def clear(self) -> None:
+        """Remove all values."""
+        ...
+
+
+class InMemoryBackend:
+    """Thread-safe LRU backend with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        # key -> (expiry timestamp or None, value), least recently used first
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCacheBackend:
+    """File backend that persists entries across processes.
+
+    Each entry is pickled to ``<key>.pkl`` as ``(expiry, value)``. Writes go
+    through a temporary file and an atomic rename, so concurrent processes
+    never observe a partially written entry.
+    """
+
+    def __init__(self, directory: str | Path = DEFAULT_DISK_CACHE_DIR) -> None:
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pkl"
+
+    def get(self, key: str) -> Any | None:
+        path = self._path(key)
+        try:
+            with path.open("rb") as f:
+                expires_at, value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupt or incompatible entry: treat as a miss
+            path.unlink(missing_ok=True)
+            return None
+        if expires_at is not None and expires_at < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        expires_at = time.time() + ttl if ttl is not None else None
+        tmp_path = self.directory / f"{key}.{uuid.uuid4().hex}.tmp"
+        with tmp_path.open("wb") as f:
+            pickle.dump((expires_at, value), f)
+        os.replace(tmp_path, self._path(key))
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.pkl"):
+            path.unlink(missing_ok=True)
+
+
+class LLMCache:
+    """Keyed response cache with hit/miss statistics."""
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        ttl: float | None = 3600.0,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            backend: Storage backend (defaults to an in-memory LRU).
+            ttl: Seconds before an entry expires, or None to never expire.
+        """
+        self.backend: CacheBackend = backend if backend is not None else InMemoryBackend()
+        self.ttl = ttl
+        self.stats: dict[str, int] = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+    ) -> str:
+        """Build a cache key from everything that determines the response."""
+        sorted_tools = sorted(tools or [], key=lambda t: json.dumps(t, sort_keys=True))
+        payload = {"model": model, "messages": messages, "tools": sorted_tools}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> Any | None:
+        """Look up a cached response, updating the hit/miss counters."""
+        value = self.backend.get(key)
+        self.stats["hits" if value is not None else "misses"] += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a response under the configured TTL."""
+        self.backend.set(key, value, self.ttl)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self.backend.clear()
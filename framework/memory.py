@@ -0,0 +1,240 @@
+"""Token-budgeted conversation memory for long-running sessions.
+
+After each turn, ``MemoryManager.maybe_compact`` counts the conversation's
+tokens with tiktoken. Once the total passes a fraction of the limit, the
+middle of the history is replaced by a single summary message written by a
+cheap model, keeping the system prompt and the latest exchange intact.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pickle
+import uuid
+from typing import TYPE_CHECKING
+
+from framework.agent import Conversation, Message
+from framework.llm import completion_request
+from framework.llm_cache import DEFAULT_DISK_CACHE_DIR
+
+if TYPE_CHECKING:
+    import tiktoken
+
+_logger = logging.getLogger(__name__)
+
+# Fallback encoding when the tokenizer model is unknown to tiktoken
+_DEFAULT_ENCODING = "o200k_base"
+# Per-message cap on the transcript sent to the summarizer
+_MAX_TRANSCRIPT_CHARS_PER_MESSAGE = 2000
+# Directory holding pickled encodings, so later processes skip the BPE parse
+_ENCODING_CACHE_DIR = DEFAULT_DISK_CACHE_DIR / "tiktoken"
+
+_SUMMARY_SYSTEM_PROMPT = """\
+You compress the history of a conversation between a user and a SQL agent. \
+Write a concise summary that preserves everything needed to continue the \
+session: the user's questions, schemas and tables explored, exact column \
+names, business rules that were applied, SQL that worked or failed (and why), \
+and any answers already submitted. Omit pleasantries and raw result dumps.
+"""
+
+
+def _load_encoding(name: str) -> tiktoken.Encoding:
+    """Load a tiktoken encoding, going through a pickled copy on disk.
+
+    ``tiktoken.get_encoding`` reads and parses the BPE merges file on every
+    cold start. The parsed constructor arguments are pickled on first use and
+    loaded directly afterwards.
+    """
+    import tiktoken
+
+    path = _ENCODING_CACHE_DIR.expanduser() / f"{name}.pkl"
+    try:
+        with path.open("rb") as f:
+            return tiktoken.Encoding(**pickle.load(f))
+    except FileNotFoundError:
+        pass
+    except Exception:
+        _logger.debug("Ignoring unreadable encoding cache %s", path, exc_info=True)
+
+    encoding = tiktoken.get_encoding(name)
+    state = {
+        "name": encoding.name,
+        "pat_str": encoding._pat_str,
+        "mergeable_ranks": encoding._mergeable_ranks,
+        "special_tokens": encoding._special_tokens,
+    }
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        _logger.debug("Could not write encoding cache %s", path, exc_info=True)
+    return encoding
+
+
+def _message_texts(messages: list[Message]) -> list[str]:
+    """Return the texts that count toward the token budget."""
+    texts: list[str] = []
+    for msg in messages:
+        if msg.content:
+            texts.append(msg.content)
+        if msg.tool_calls:
+            texts.append(json.dumps(msg.tool_calls))
+    return texts
+
+
+def _tokens_upper_bound(texts: list[str]) -> int:
+    """Return a cheap upper bound on the token count of ``texts``.
+
+    Every byte-level BPE token covers at least one UTF-8 byte, so the byte
+    length can never undercount.
+    """
+    return sum(len(text.encode("utf-8")) for text in texts)
+
+
+def _tail_start(messages: list[Message]) -> int:
+    """Return the index where the preserved tail of the history begins.
+
+    The tail is the last message; if that is a tool result, it is extended
+    back to the assistant message whose tool call it answers, so the API
+    still sees a well-formed call/result pair.
+    """
+    start = len(messages) - 1
+    while start > 1 and messages[start].role == "tool":
+        start -= 1
+    return start
+
+
+def _format_transcript(messages: list[Message]) -> str:
+    """Render messages as plain text for the summarizer."""
+    lines: list[str] = []
+    for msg in messages:
+        parts: list[str] = []
+        if msg.content:
+            parts.append(msg.content[:_MAX_TRANSCRIPT_CHARS_PER_MESSAGE])
+        if msg.tool_calls:
+            for tc in msg.tool_calls:
+                func = tc.get("function", {})
+                parts.append(f"[calls {func.get('name', '')}({func.get('arguments', '')})]")
+        if parts:
+            lines.append(f"{msg.role.upper()}: " + "\n".join(parts))
+    return "\n\n".join(lines)
+
+
+class MemoryManager:
+    """Summarizes the middle of a conversation when it nears a token limit."""
+
+    def __init__(
+        self,
+        api_key: str,
+        token_limit: int = 100_000,
+        model_tokenizer: str = "gpt-4o",
+        summary_model: str = "openai/gpt-oss-120b:nitro",
+        trigger_ratio: float = 0.8,
+    ) -> None:
+        """
+        Initialize the memory manager.
+
+        Args:
+            api_key: OpenRouter API key (used for the summarizer call).
+            token_limit: Context budget for the conversation, in tokens.
+            model_tokenizer: Model name used to pick the tiktoken encoding.
+            summary_model: Cheap model used to write the summary.
+            trigger_ratio: Compact once the history exceeds this fraction
+                of token_limit.
+        """
+        self.api_key = api_key
+        self.token_limit = token_limit
+        self.model_tokenizer = model_tokenizer
+        self.summary_model = summary_model
+        self.trigger_ratio = trigger_ratio
+        self._encoding: tiktoken.Encoding | None = None
+        # Token counts of the texts seen on the previous count, so each turn
+        # only encodes the messages added since then
+        self._token_counts: dict[str, int] = {}
+
+    def _get_encoding(self) -> tiktoken.Encoding:
+        """Import tiktoken and load the encoding on first use (may fetch BPE files)."""
+        if self._encoding is None:
+            import tiktoken
+
+            try:
+                name = tiktoken.encoding_name_for_model(self.model_tokenizer)
+            except KeyError:
+                name = _DEFAULT_ENCODING
+            self._encoding = _load_encoding(name)
+        return self._encoding
+
+    def count_tokens(self, messages: list[Message]) -> int:
+        """Count the tokens in message contents and tool-call payloads."""
+        texts = _message_texts(messages)
+        previous = self._token_counts
+        new_texts = list({text: None for text in texts if text not in previous})
+        counts = {text: previous[text] for text in texts if text in previous}
+        if new_texts:
+            encoded = self._get_encoding().encode_batch(new_texts, disallowed_special=())
+            counts.update(zip(new_texts, map(len, encoded), strict=True))
+        # Keep only texts still in the history, so compacted messages are dropped
+        self._token_counts = counts
+        return sum(counts[text] for text in texts)
+
+    def maybe_compact(self, conversation: Conversation) -> bool:
+        """Summarize the middle of the conversation if it is over budget.
+
+        Returns:
+            True if the history was compacted, False otherwise.
+        """
+        messages = conversation.messages
+        budget = self.trigger_ratio * self.token_limit
+        # Short histories are under budget even at one token per byte
+        if _tokens_upper_bound(_message_texts(messages)) <= budget:
+            return False
+        try:
+            total_tokens = self.count_tokens(messages)
+        except Exception:
+            _logger.warning("Token counting unavailable; skipping compaction", exc_info=True)
+            return False
+        if total_tokens <= budget:
+            return False
+
+        tail_start = _tail_start(messages)
+        middle = messages[1:tail_start]
+        if not middle:
+            return False
+
+        summary = self._summarize(middle)
+        if not summary:
+            return False
+
+        conversation.messages = [
+            messages[0],
+            Message(
+                role="system",
+                content=f"Summary of the earlier conversation:\n{summary}",
+            ),
+            *messages[tail_start:],
+        ]
+        _logger.info("Compacted %d messages into a summary", len(middle))
+        return True
+
+    def _summarize(self, messages: list[Message]) -> str:
+        """Ask the summary model to compress a slice of the history."""
+        try:
+            response = completion_request(
+                api_key=self.api_key,
+                model=self.summary_model,
+                messages=[
+                    {"role": "system", "content": _SUMMARY_SYSTEM_PROMPT},
+                    {"role": "user", "content": _format_transcript(messages)},
+                ],
+                temperature=0.0,
+            )
+        except Exception:
+            _logger.warning("Conversation summary failed; keeping full history", exc_info=True)
+            return ""
+        return response.strip()
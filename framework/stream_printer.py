@@ -1,14 +1,52 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import json
-from collections.abc import Iterator
+import math
+import time
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
 
 from rich.console import Console
 from rich.markup import escape
+from rich.text import Text
 
 from framework.agent import AgentEvent, EventType
 from framework.llm import TokenUsage
 
+type TextFragment = str | tuple[str, str]
+
+
+class BufferedConsole(Console):
+    """Rich console that batches streamed text fragments into whole lines.
+
+    Every ``Console.print`` call renders its arguments and emits ANSI codes,
+    which is expensive when called once per streamed token. ``write`` only
+    buffers (text, style) fragments; ``writeln`` renders the buffered line
+    with a single ``print`` call.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._line_buffer: list[TextFragment] = []
+
+    def write(self, *fragments: TextFragment) -> None:
+        """Buffer text fragments without rendering them."""
+        self._line_buffer.extend(fragments)
+
+    def writeln(self, *fragments: TextFragment, **kwargs: Any) -> None:
+        """Buffer fragments, then render the whole line in one print call."""
+        self._line_buffer.extend(fragments)
+        line = Text.assemble(*self._line_buffer)
+        self._line_buffer.clear()
+        super().print(line, **kwargs)
+
+    def flush_line(self) -> None:
+        """Render any buffered fragments without terminating the line."""
+        if self._line_buffer:
+            self.writeln(end="")
+
 
 class StreamPrinter:
     """Helper class to print agent events in a formatted way using rich."""
@@ -21,6 +59,7 @@ class StreamPrinter:
         show_tool_results: bool = True,
         show_token_usage: bool = True,
         console: Console | None = None,
+        flush_hz: float = 60.0,
     ) -> None:
         """
         Initialize the stream printer.
@@ -30,16 +69,66 @@ class StreamPrinter:
             show_tool_calls: Whether to display tool calls.
             show_tool_results: Whether to display tool results.
             show_token_usage: Whether to display token usage at the end.
-            console: Rich Console instance (defaults to new Console with stdout).
+            console: Rich Console instance (defaults to a new BufferedConsole
+                with stdout). Streamed chunks are line-buffered when a
+                BufferedConsole is used.
+            flush_hz: Max rate at which a partial streamed line is rendered
+                (0 renders only at newlines). ``aprint_stream`` also renders a
+                partial line left at the end of a burst on a timer;
+                ``print_stream`` only checks when the next chunk or event
+                arrives.
         """
         self.show_thinking = show_thinking
         self.show_tool_calls = show_tool_calls
         self.show_tool_results = show_tool_results
         self.show_token_usage = show_token_usage
-        self.console = console if console is not None else Console()
+        self.console = console if console is not None else BufferedConsole()
+        self._flush_interval = 1.0 / flush_hz if flush_hz > 0 else math.inf
+        self._last_flush = time.monotonic()
+
+    def _write_chunk(self, chunk: str, style: str = "") -> None:
+        """Write a streamed text fragment, rendering only at line boundaries."""
+        if not isinstance(self.console, BufferedConsole):
+            self.console.print(Text(chunk, style=style), end="")
+            return
+        *complete_lines, partial = chunk.split("\n")
+        for line in complete_lines:
+            self.console.writeln((line, style))
+        if partial:
+            self.console.write((partial, style))
+
+        # Render at most once per flush interval; tokens arriving in between
+        # are batched into the same write
+        now = time.monotonic()
+        if complete_lines:
+            self._last_flush = now
+        elif now - self._last_flush >= self._flush_interval:
+            self.console.flush_line()
+            self._last_flush = now
+
+    async def _flush_periodically(self) -> None:
+        """Render a partial line that has waited a full flush interval."""
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            if time.monotonic() - self._last_flush >= self._flush_interval:
+                self._flush_chunks()
+                self._last_flush = time.monotonic()
+
+    def _flush_chunks(self) -> None:
+        """Render any partially buffered line before other output."""
+        if isinstance(self.console, BufferedConsole):
+            self.console.flush_line()
 
     def print_event(self, event: AgentEvent) -> None:
         """Print a single event."""
+        if event.type not in (
+            EventType.THINKING_START,
+            EventType.THINKING_CHUNK,
+            EventType.THINKING_END,
+            EventType.RESPONSE_CHUNK,
+        ):
+            self._flush_chunks()
+
         match event.type:
             case EventType.ITERATION_START:
                 iteration = event.data.get("iteration", "?")
@@ -51,26 +140,21 @@ class StreamPrinter:
 
             case EventType.THINKING_START:
                 if self.show_thinking:
+                    self._flush_chunks()
                     self.console.print()
-                    self.console.print(escape("[Thinking] "), style="cyan", end="")
+                    self._write_chunk("[Thinking] ", style="cyan")
 
             case EventType.THINKING_CHUNK:
                 if self.show_thinking:
-                    chunk = event.data.get("chunk", "")
-                    self.console.print(
-                        escape(chunk),
-                        style="dim",
-                        end="",
-                    )
+                    self._write_chunk(event.data.get("chunk", ""), style="dim")
 
             case EventType.THINKING_END:
                 if self.show_thinking:
-                    self.console.print(escape(" [/Thinking]"), style="cyan")
+                    self._write_chunk(" [/Thinking]\n", style="cyan")
                     self.console.print()
 
             case EventType.RESPONSE_CHUNK:
-                chunk = event.data.get("chunk", "")
-                self.console.print(escape(chunk), end="", highlight=False)
+                self._write_chunk(event.data.get("chunk", ""))
 
             case EventType.TOOL_CALL_PARSED:
                 if self.show_tool_calls:
@@ -124,8 +208,41 @@ class StreamPrinter:
             The final response from the agent.
         """
         final_response = ""
-        for event in events:
-            self.print_event(event)
-            if event.type == EventType.AGENT_COMPLETE:
-                final_response = event.data.get("response", "")
+        try:
+            for event in events:
+                self.print_event(event)
+                if event.type == EventType.AGENT_COMPLETE:
+                    final_response = event.data.get("response", "")
+        finally:
+            self._flush_chunks()
+        return final_response
+
+    async def aprint_stream(self, events: AsyncIterator[AgentEvent]) -> str:
+        """
+        Print all events from an async stream and return the final response.
+
+        Args:
+            events: Async iterator of AgentEvent objects (e.g. Agent.run_async).
+
+        Returns:
+            The final response from the agent.
+        """
+        final_response = ""
+        # Without new chunks nothing else would render the tail of a burst
+        flusher = (
+            asyncio.ensure_future(self._flush_periodically())
+            if isinstance(self.console, BufferedConsole) and math.isfinite(self._flush_interval)
+            else None
+        )
+        try:
+            async for event in events:
+                self.print_event(event)
+                if event.type == EventType.AGENT_COMPLETE:
+                    final_response = event.data.get("response", "")
+        finally:
+            if flusher is not None:
+                flusher.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await flusher
+            self._flush_chunks()
         return final_response
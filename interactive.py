@@ -5,23 +5,81 @@ This script provides a command-line interface to interact with your agent,
 allowing you to enter prompts and receive streaming responses.
 """
 
+from __future__ import annotations
+
 import argparse
+import asyncio
+import contextlib
+import functools
+import importlib
+import os
+import signal
+from collections.abc import Awaitable, Callable
+from dataclasses import replace
+from typing import TYPE_CHECKING
+
+# Heavy dependencies (rich, the agent framework, and the tool modules with
+# their SQL/embedding stacks) are imported on first use so that argument
+# parsing and `--help` stay fast.
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.panel import Panel
+
+    from framework.agent import Agent, Tool
+    from framework.llm import OpenRouterConfig
+
+# (module, attribute) for each static tool, in the order they are offered
+TOOL_MODULES: list[tuple[str, str]] = [
+    ("tools.submit_answer", "SUBMIT_ANSWER"),
+    ("tools.execute_sql", "EXECUTE_SQL"),
+    ("tools.sql_jobs", "SUBMIT_SQL_JOB"),
+    ("tools.sql_jobs", "POLL_SQL_JOB"),
+    ("tools.schema_info", "LIST_SCHEMAS"),
+    ("tools.schema_info", "DESCRIBE_TABLE"),
+    ("tools.search_column", "SEARCH_COLUMN"),
+    ("tools.business_rules", "GET_BUSINESS_RULES"),
+    ("tools.check_sql", "CHECK_SQL"),
+]
 
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Prompt
 
-from framework.agent import Agent, Tool
-from framework.llm import OpenRouterConfig
-from framework.stream_printer import StreamPrinter
-from tools.business_rules import GET_BUSINESS_RULES
-from tools.check_sql import CHECK_SQL, configure as configure_check_sql
-from tools.execute_sql import EXECUTE_SQL
-from tools.generate_sql import configure as configure_generate_sql
-from tools.generate_sql import create_generate_sql_tool
-from tools.schema_info import DESCRIBE_TABLE, LIST_SCHEMAS
-from tools.search_column import SEARCH_COLUMN
-from tools.submit_answer import SUBMIT_ANSWER
+# Static panels are built once, on first use, so printing them skips markup parsing
+@functools.cache
+def _welcome_panel() -> Panel:
+    from rich.panel import Panel
+    from rich.text import Text
+
+    return Panel(
+        Text.from_markup(
+            "[bold cyan]Agent Interactive REPL[/bold cyan]\n\n"
+            "Enter your prompts to interact with the agent.\n"
+            "The agent has access to tools for answering questions.\n\n"
+            "[dim]Commands:[/dim]\n"
+            "  [yellow]quit[/yellow] or [yellow]exit[/yellow] - Exit the REPL\n"
+            "  [yellow]reset[/yellow] - Reset the conversation history\n"
+            "  [yellow]help[/yellow] - Show this help message"
+        ),
+        title="Welcome",
+        border_style="blue",
+    )
+
+
+@functools.cache
+def _help_panel() -> Panel:
+    from rich.panel import Panel
+    from rich.text import Text
+
+    return Panel(
+        Text.from_markup(
+            "[bold]Available Commands:[/bold]\n\n"
+            "  [yellow]quit[/yellow] / [yellow]exit[/yellow] - Exit the interactive session\n"
+            "  [yellow]reset[/yellow] - Clear conversation history and start fresh\n"
+            "  [yellow]help[/yellow] - Display this help message\n\n"
+            "[bold]Tips:[/bold]\n"
+            "  - Multi-line input is not supported; keep prompts on a single line"
+        ),
+        title="Help",
+        border_style="green",
+    )
 
 
 def create_tools(config: OpenRouterConfig) -> dict[str, Tool]:
@@ -33,66 +91,117 @@ def create_tools(config: OpenRouterConfig) -> dict[str, Tool]:
     Returns:
         Dictionary mapping tool names to Tool instances.
     """
+    from tools.check_sql import configure as configure_check_sql
+    from tools.generate_sql import configure as configure_generate_sql
+    from tools.generate_sql import create_generate_sql_tool
+
     configure_generate_sql(
         api_key=config.api_key,
         nl2sql_model=config.nl2sql_model,
     )
     configure_check_sql(api_key=config.api_key)
+
+    tools: dict[str, Tool] = {}
+    for module_name, attr in TOOL_MODULES:
+        tool = getattr(importlib.import_module(module_name), attr)
+        tools[tool.name] = tool
     gen_sql_tool = create_generate_sql_tool()
-    return {
-        SUBMIT_ANSWER.name: SUBMIT_ANSWER,
-        EXECUTE_SQL.name: EXECUTE_SQL,
-        LIST_SCHEMAS.name: LIST_SCHEMAS,
-        DESCRIBE_TABLE.name: DESCRIBE_TABLE,
-        SEARCH_COLUMN.name: SEARCH_COLUMN,
-        GET_BUSINESS_RULES.name: GET_BUSINESS_RULES,
-        CHECK_SQL.name: CHECK_SQL,
-        gen_sql_tool.name: gen_sql_tool,
-    }
-
-
-def create_agent(api_key: str) -> Agent:
+    tools[gen_sql_tool.name] = gen_sql_tool
+    return tools
+
+
+def create_agent(api_key: str, use_cache: bool = False) -> Agent:
     """Create and configure the agent with default settings.
 
     Args:
         api_key: OpenRouter API key.
+        use_cache: Decode greedily (temperature 0) and replay identical
+            requests from a response cache.
 
     Returns:
         Configured Agent instance.
     """
+    from framework.agent import Agent
+    from framework.llm import OpenRouterConfig
+    from framework.llm_cache import DiskCacheBackend, LLMCache
+
     config = OpenRouterConfig(
         api_key=api_key,
         # minimax for tool call/routing, claude-opus-4.6 for NL2SQL
+        # Long REPL sessions benefit most from provider-side prefix caching
+        cache_friendly_memory=True,
     )
+    cache = None
+    if use_cache:
+        # The agent only caches at temperature 0, where responses are reproducible
+        config = replace(config, temperature=0.0)
+        # Opt in to persisting responses across REPL restarts with AGENT_REPL_CACHE=1
+        backend = DiskCacheBackend() if os.environ.get("AGENT_REPL_CACHE") == "1" else None
+        cache = LLMCache(backend=backend)
     tools = create_tools(config)
-    return Agent(config=config, tools=tools)
+    return Agent(config=config, tools=tools, cache=cache, tool_concurrency_limit=4)
 
 
 def print_welcome(console: Console) -> None:
     """Print a welcome message and usage instructions."""
-    welcome_text = (
-        "[bold cyan]Agent Interactive REPL[/bold cyan]\n\n"
-        "Enter your prompts to interact with the agent.\n"
-        "The agent has access to tools for answering questions.\n\n"
-        "[dim]Commands:[/dim]\n"
-        "  [yellow]quit[/yellow] or [yellow]exit[/yellow] - Exit the REPL\n"
-        "  [yellow]reset[/yellow] - Reset the conversation history\n"
-        "  [yellow]help[/yellow] - Show this help message"
-    )
-    console.print(Panel(welcome_text, title="Welcome", border_style="blue"))
+    console.print(_welcome_panel())
 
 
 def print_help(console: Console) -> None:
     """Print help information."""
-    help_text = (
-        "[bold]Available Commands:[/bold]\n\n"
-        "  [yellow]quit[/yellow] / [yellow]exit[/yellow] - Exit the interactive session\n"
-        "  [yellow]reset[/yellow] - Clear conversation history and start fresh\n"
-        "  [yellow]help[/yellow] - Display this help message\n\n"
-        "[bold]Tips:[/bold]\n"
-        "  - Multi-line input is not supported; keep prompts on a single line"
+    console.print(_help_panel())
+
+
+def _make_input_reader() -> Callable[[], Awaitable[str]]:
+    """Build the coroutine function that reads one line of user input.
+
+    Uses a prompt_toolkit session (built once, with up-arrow history persisted
+    to ``.repl_history``) that waits on the event loop. Falls back to rich's
+    blocking prompt on a worker thread if prompt_toolkit is not installed.
+    """
+    try:
+        from prompt_toolkit import PromptSession  # ty: ignore[unresolved-import]
+        from prompt_toolkit.formatted_text import ANSI  # ty: ignore[unresolved-import]
+        from prompt_toolkit.history import FileHistory  # ty: ignore[unresolved-import]
+    except ImportError:
+        from rich.prompt import Prompt
+
+        return functools.partial(asyncio.to_thread, Prompt.ask, "[bold blue]You[/bold blue]")
+
+    session: PromptSession[str] = PromptSession(
+        message=ANSI("\x1b[1;34mYou\x1b[0m: "),
+        history=FileHistory(".repl_history"),
     )
-    console.print(Panel(help_text, title="Help", border_style="green"))
+    return session.prompt_async
+
+
+# ── REPL commands ──
+# Each handler returns False to end the session, True to keep reading input.
+
+
+def _quit(agent: Agent, console: Console) -> bool:
+    console.print("\n[dim]Goodbye![/dim]")
+    return False
+
+
+def _reset(agent: Agent, console: Console) -> bool:
+    agent.reset_conversation()
+    console.print("[yellow]Conversation reset.[/yellow]\n")
+    return True
+
+
+def _help(agent: Agent, console: Console) -> bool:
+    print_help(console)
+    return True
+
+
+# Casefolded command word -> handler
+COMMANDS: dict[str, Callable[[Agent, Console], bool]] = {
+    "quit": _quit,
+    "exit": _quit,
+    "reset": _reset,
+    "help": _help,
+}
 
 
 def parse_args() -> argparse.Namespace:
@@ -105,61 +214,105 @@ def parse_args() -> argparse.Namespace:
         required=True,
         help="OpenRouter API key",
     )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Decode at temperature 0 and replay identical requests from a response cache",
+    )
     return parser.parse_args()
 
 
-def main() -> None:
-    """Run the interactive REPL."""
-    args = parse_args()
+async def run_repl(api_key: str, use_cache: bool = False) -> None:
+    """Run the REPL loop on the current event loop.
+
+    Input is read asynchronously and agent events are consumed from
+    ``Agent.run_async``, so the loop never blocks on the terminal or on
+    network I/O. Ctrl-C cancels the current step rather than the session.
+    """
+    from framework.memory import MemoryManager
+    from framework.stream_printer import BufferedConsole, StreamPrinter
 
-    console = Console()
+    console = BufferedConsole()
     printer = StreamPrinter(
         show_thinking=True,
         show_tool_calls=True,
         show_tool_results=True,
         console=console,
+        flush_hz=60,
     )
 
     print_welcome(console)
 
     console.print("\n[dim]Connecting to OpenRouter...[/dim]")
-    agent = create_agent(args.api_key)
+    agent = create_agent(api_key, use_cache=use_cache)
+    memory = MemoryManager(api_key=api_key)
     console.print("[green]Connected successfully![/green]\n")
+    read_input = _make_input_reader()
 
-    while True:
-        try:
-            # Get user input
-            user_input = Prompt.ask("[bold blue]You[/bold blue]")
+    main_task = asyncio.current_task()
+    assert main_task is not None
+    # Route every Ctrl-C to a cancellation of the current step (Unix only;
+    # elsewhere asyncio's default SIGINT handling applies)
+    with contextlib.suppress(NotImplementedError):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGINT, main_task.cancel)
 
-            # Handle empty input
-            if not user_input.strip():
-                continue
+    # A prompt interrupted by a cancellation keeps running; reuse it rather
+    # than starting a second reader on stdin
+    pending_input: asyncio.Future[str] | None = None
+
+    try:
+        while True:
+            try:
+                # Get user input
+                if pending_input is None:
+                    pending_input = asyncio.ensure_future(read_input())
+                user_input = await asyncio.shield(pending_input)
+                pending_input = None
+
+                # Handle empty input
+                stripped = user_input.strip()
+                if not stripped:
+                    continue
+
+                # Handle special commands
+                handler = COMMANDS.get(stripped.casefold())
+                if handler is not None:
+                    if not handler(agent, console):
+                        break
+                    continue
 
-            # Handle special commands
-            command = user_input.strip().lower()
-            if command in ("quit", "exit"):
+                # Run the agent on the user input and stream the response
+                console.print()
+                cache_hits = agent.cache.stats["hits"] if agent.cache is not None else 0
+                async with contextlib.aclosing(agent.run_async(user_input)) as events:
+                    await printer.aprint_stream(events)
+                console.print()
+                if agent.cache is not None and agent.cache.stats["hits"] > cache_hits:
+                    console.print("[dim]Served from the response cache.[/dim]\n")
+
+                # Keep long sessions within the context budget
+                if await asyncio.to_thread(agent.update_conversation, memory.maybe_compact):
+                    console.print("[dim]Earlier conversation summarized to save context.[/dim]\n")
+
+            except (KeyboardInterrupt, asyncio.CancelledError):
+                main_task.uncancel()
+                # The prompt itself raised (Ctrl-C while typing): start a new one
+                if pending_input is not None and pending_input.done():
+                    pending_input = None
+                console.print("\n\n[dim]Interrupted. Type 'quit' to exit.[/dim]\n")
+                continue
+            except EOFError:
                 console.print("\n[dim]Goodbye![/dim]")
                 break
-            elif command == "reset":
-                agent.reset_conversation()
-                console.print("[yellow]Conversation reset.[/yellow]\n")
-                continue
-            elif command == "help":
-                print_help(console)
-                continue
+    finally:
+        # Release pooled HTTP connections shared across turns
+        agent.close()
+
 
-            # Run the agent on the user input and stream the response
-            console.print()
-            events = agent.run(user_input)
-            printer.print_stream(events)
-            console.print()
-
-        except KeyboardInterrupt:
-            console.print("\n\n[dim]Interrupted. Type 'quit' to exit.[/dim]\n")
-            continue
-        except EOFError:
-            console.print("\n[dim]Goodbye![/dim]")
-            break
+def main() -> None:
+    """Run the interactive REPL."""
+    args = parse_args()
+    asyncio.run(run_repl(args.api_key, use_cache=args.cache))
 
 
 if __name__ == "__main__":
@@ -6,7 +6,8 @@ Three-stage retrieval:
       a high-confidence match is found (score >= 50).
   Stage 2 (semantic embedding): If Stage 1 is uncertain, computes cosine
       similarity between the query and pre-computed guide embeddings using
-      a local sentence-transformers model (all-MiniLM-L6-v2).
+      a local all-MiniLM-L6-v2 model (ONNX Runtime when available, else
+      sentence-transformers).
   Stage 3 (LLM validation): An optional LLM-based check that verifies the
       retrieved guide is the right one for the query. If the model disagrees,
       the next-best alternative is returned instead.
@@ -14,9 +15,22 @@ Three-stage retrieval:
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import logging
+import os
 import re
+import sys
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import accumulate
+from operator import itemgetter
 from pathlib import Path
+from typing import NamedTuple
 
 import numpy as np
 
@@ -27,13 +41,34 @@ _logger = logging.getLogger(__name__)
 
 # Directory containing all business rules guides
 GUIDES_DIR = Path(__file__).parent.parent / "evaluation" / "data" / "guides"
+# On-disk cache of guide embeddings, invalidated when any guide changes
+_EMBEDDINGS_CACHE_FILE = GUIDES_DIR / ".embeddings.npz"
 
 # Local embedding model name (small, fast, 384-dim)
 _EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+# Hugging Face repo with the ONNX export and fast tokenizer of the same model
+_ONNX_MODEL_REPO = f"sentence-transformers/{_EMBEDDING_MODEL_NAME}"
+# Max tokens per text (matches the model's sentence-transformers config)
+_ONNX_MAX_SEQ_LENGTH = 256
 
 # Module-level state for lazy-loaded model and cached guide embeddings
 _embedding_model: object | None = None
+_embedding_model_lock = threading.Lock()
 _guide_embeddings: np.ndarray | None = None
+# int8-quantized copy of the guide embeddings and its per-row dequantization
+# scales (1-D), used for Stage 2 similarity
+_guide_embeddings_i8: np.ndarray | None = None
+_guide_scales: np.ndarray | None = None
+# Per-thread similarity buffers, reused across Stage 2 searches
+_similarity_buffers = threading.local()
+
+# LRU of query embeddings keyed by the raw query (agents often retry a term)
+_QUERY_EMBEDDING_CACHE_SIZE = 128
+_query_embeddings: OrderedDict[str, np.ndarray] = OrderedDict()
+_query_embeddings_lock = threading.Lock()
+# Embeds the query in the background while Stage 1 scores it. The model
+# runs in native code that releases the GIL, so the two overlap.
+_EMBED_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query-embed")
 
 # Stage 1 threshold: if the regex score is at or above this, skip Stage 2
 _STAGE1_CONFIDENCE_THRESHOLD = 50.0
@@ -43,6 +78,9 @@ _STAGE2_SIMILARITY_THRESHOLD = 0.25
 # top score AND >= this absolute value, include it alongside the top guide.
 _MULTI_GUIDE_RELATIVE_THRESHOLD = 0.6   # runner-up must be >= 60% of top
 _MULTI_GUIDE_ABSOLUTE_THRESHOLD = 30.0  # and at least this score
+# Stage 1 candidates kept per search: enough for the validator's ten
+# alternatives even when the selected guide is among them
+_STAGE1_TOP_K = 11
 
 # ---------------------------------------------------------------------------
 # Stage 3: LLM-based guide validation (optional)
@@ -79,20 +117,22 @@ def init_guide_validator(api_key: str, model: str = "openai/gpt-oss-120b") -> No
 def _validate_guide_selection(
     search_term: str,
     selected: _GuideEntry,
-    alternatives: list[_GuideEntry],
+    ranked: Sequence[tuple[float, int]],
 ) -> _GuideEntry:
     """Validate the selected guide using an LLM; return the best match.
 
-    If the LLM says the selection is wrong and names a valid alternative,
-    that alternative is returned. Otherwise the original selection is kept.
+    Alternatives are drawn from ``ranked`` (Stage 1 ``(score, guide index)``
+    pairs) and only collected when the validator is configured. If the LLM
+    says the selection is wrong and names a valid alternative, that
+    alternative is returned. Otherwise the original selection is kept.
     """
     if not _validator_api_key:
         return selected
 
+    alternatives = _all_alternatives_for(selected, ranked)
     alt_lines = "\n".join(
         f"- {e.title} (schema: {e.schema_hint})"
         for e in alternatives
-        if e.path != selected.path
     )
     if not alt_lines:
         return selected
@@ -125,12 +165,12 @@ def _validate_guide_selection(
             # Find the suggested alternative (fuzzy title match)
             suggested_lower = suggested_title.lower()
             for alt in alternatives:
-                title = (alt.title or alt.path.stem).lower()
+                title = alt.title_lower or alt.stem_lower
                 if suggested_lower in title or title in suggested_lower:
                     return alt
             # Try matching on schema hint
             for alt in alternatives:
-                if alt.schema_hint and suggested_lower in alt.schema_hint.lower():
+                if alt.schema_hint_lower and suggested_lower in alt.schema_hint_lower:
                     return alt
             _logger.warning(
                 "Validator suggested '%s' but no matching guide found",
@@ -143,25 +183,87 @@ def _validate_guide_selection(
 
 
 # ---------------------------------------------------------------------------
-# Embedding helpers (local sentence-transformers)
+# Embedding helpers (local ONNX Runtime or sentence-transformers)
 # ---------------------------------------------------------------------------
 
+class _OnnxEmbedder:
+    """Runs the embedding model with ONNX Runtime and a fast tokenizer.
+
+    Exposes the subset of ``SentenceTransformer.encode`` used here, with the
+    same mean pooling, so both backends produce interchangeable embeddings.
+    """
+
+    def __init__(self) -> None:
+        import onnxruntime as ort  # ty: ignore[unresolved-import]
+        from huggingface_hub import hf_hub_download
+        from tokenizers import Tokenizer
+
+        model_path = hf_hub_download(_ONNX_MODEL_REPO, "onnx/model.onnx")
+        tokenizer_path = hf_hub_download(_ONNX_MODEL_REPO, "tokenizer.json")
+
+        self._session = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+        self._input_names = {inp.name for inp in self._session.get_inputs()}
+        self._tokenizer = Tokenizer.from_file(tokenizer_path)
+        self._tokenizer.enable_padding()
+        self._tokenizer.enable_truncation(max_length=_ONNX_MAX_SEQ_LENGTH)
+
+    def encode(self, texts: list[str], normalize_embeddings: bool = True) -> np.ndarray:
+        encodings = self._tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+
+        token_embeddings = self._session.run(None, feeds)[0]
+
+        # Mean pooling over non-padding tokens
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if normalize_embeddings:
+            pooled /= np.sqrt(np.einsum("ij,ij->i", pooled, pooled))[:, None]
+        return pooled.astype(np.float32, copy=False)
+
+
 def _get_embedding_model():
-    """Lazily load the sentence-transformers model.
+    """Lazily load the embedding model.
+
+    Prefers an ONNX Runtime session (faster single-query latency than the
+    PyTorch forward pass) and falls back to sentence-transformers if
+    onnxruntime/tokenizers or the ONNX export are unavailable. The model is
+    loaded once and cached in a module-level variable.
 
-    The model is loaded once and cached in a module-level variable.
-    Returns the SentenceTransformer model instance, or None on failure.
+    Returns an object with an ``encode`` method, or None on failure.
     """
     global _embedding_model  # noqa: PLW0603
     if _embedding_model is not None:
         return _embedding_model
 
+    # The query-embedding thread and the caller may both get here first
+    with _embedding_model_lock:
+        if _embedding_model is None:
+            _embedding_model = _load_embedding_model()
+        return _embedding_model
+
+
+def _load_embedding_model():
+    """Load the ONNX embedder, or sentence-transformers as a fallback."""
+    try:
+        embedder = _OnnxEmbedder()
+        _logger.info("Loaded ONNX embedding model: %s", _ONNX_MODEL_REPO)
+        return embedder
+    except Exception:
+        _logger.debug(
+            "ONNX embedding model unavailable; falling back to sentence-transformers",
+            exc_info=True,
+        )
+
     try:
         from sentence_transformers import SentenceTransformer
 
-        _embedding_model = SentenceTransformer(_EMBEDDING_MODEL_NAME)
+        model = SentenceTransformer(_EMBEDDING_MODEL_NAME)
         _logger.info("Loaded embedding model: %s", _EMBEDDING_MODEL_NAME)
-        return _embedding_model
+        return model
     except Exception:
         _logger.warning(
             "Failed to load sentence-transformers model '%s'; "
@@ -172,20 +274,55 @@ def _get_embedding_model():
         return None
 
 
-def _embed_texts(texts: list[str]) -> np.ndarray | None:
-    """Embed a list of texts using the local sentence-transformers model.
+def _embed_texts(texts: list[str], normalize: bool = True) -> np.ndarray | None:
+    """Embed a list of texts using the local embedding model.
 
     Args:
         texts: List of strings to embed.
+        normalize: Whether to L2-normalize the embeddings.
 
     Returns:
-        A numpy array of shape (len(texts), dim) with L2-normalized
-        embeddings, or None if the model is unavailable.
+        A numpy array of shape (len(texts), dim), or None if the model is
+        unavailable.
     """
     model = _get_embedding_model()
     if model is None:
         return None
-    return model.encode(texts, normalize_embeddings=True)
+    return model.encode(texts, normalize_embeddings=normalize)
+
+
+def _embed_query(query: str) -> np.ndarray | None:
+    """Embed a single query, reusing the embedding of recently seen queries."""
+    with _query_embeddings_lock:
+        cached = _query_embeddings.get(query)
+        if cached is not None:
+            _query_embeddings.move_to_end(query)
+            return cached
+
+    query_vec = _embed_texts([query], normalize=False)
+    if query_vec is None:
+        return None
+    # Normalize the single vector with one dot product rather than the
+    # batched norm in the model's encode path
+    q = np.ascontiguousarray(query_vec[0], dtype=np.float32)
+    q /= np.sqrt(np.vdot(q, q))
+
+    with _query_embeddings_lock:
+        _query_embeddings[query] = q
+        while len(_query_embeddings) > _QUERY_EMBEDDING_CACHE_SIZE:
+            _query_embeddings.popitem(last=False)
+    return q
+
+
+def _quantize_int8(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Symmetrically quantize vectors (along the last axis) to int8.
+
+    Returns the int8 values and the per-vector scales; ``q / scale``
+    approximates ``x``.
+    """
+    max_abs = np.max(np.abs(x), axis=-1, keepdims=True)
+    scale = 127.0 / np.maximum(max_abs, 1e-12)
+    return np.round(x * scale).astype(np.int8), scale.astype(np.float32)
 
 
 def _ensure_guide_embeddings() -> bool:
@@ -193,197 +330,456 @@ def _ensure_guide_embeddings() -> bool:
 
     Returns True if embeddings are available, False otherwise.
     """
-    global _guide_embeddings  # noqa: PLW0603
+    global _guide_embeddings, _guide_embeddings_i8, _guide_scales  # noqa: PLW0603
     if _guide_embeddings is not None:
         return True
 
-    summaries = [entry.summary for entry in _GUIDE_INDEX]
-    embeddings = _embed_texts(summaries)
-    if embeddings is not None:
-        _guide_embeddings = embeddings
-        _logger.info("Computed embeddings for %d guides", len(summaries))
-        return True
-    return False
+    index = _get_index()
+    cache_key = _embeddings_cache_key(index)
+    embeddings = _load_cached_embeddings(cache_key)
+    if embeddings is None:
+        embeddings = _embed_texts([entry.summary for entry in index])
+        if embeddings is None:
+            return False
+        _save_cached_embeddings(cache_key, embeddings)
+        _logger.info("Computed embeddings for %d guides", len(index))
+
+    # Dense float32 rows keep the matrix kernels on their vectorized path
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    _guide_embeddings_i8, scales = _quantize_int8(embeddings)
+    _guide_scales = np.ascontiguousarray(scales[:, 0])
+    _guide_embeddings = embeddings
+    return True
+
+
+def _embeddings_cache_key(index: list[_GuideEntry]) -> str:
+    """Hash the model name and every guide's modification time."""
+    parts = [_EMBEDDING_MODEL_NAME]
+    parts.extend(f"{entry.path.name}:{entry.path.stat().st_mtime_ns}" for entry in index)
+    return hashlib.blake2b("|".join(parts).encode()).hexdigest()
+
+
+def _load_cached_embeddings(cache_key: str) -> np.ndarray | None:
+    """Return cached guide embeddings if they were built for ``cache_key``."""
+    try:
+        with np.load(_EMBEDDINGS_CACHE_FILE) as data:
+            if str(data["key"]) != cache_key:
+                return None
+            embeddings = data["embeddings"]
+    except FileNotFoundError:
+        return None
+    except Exception:
+        _logger.warning("Ignoring unreadable embeddings cache", exc_info=True)
+        return None
+    _logger.info("Loaded cached embeddings for %d guides", len(embeddings))
+    return embeddings
+
+
+def _save_cached_embeddings(cache_key: str, embeddings: np.ndarray) -> None:
+    """Persist guide embeddings so later processes can skip encoding."""
+    tmp_path = _EMBEDDINGS_CACHE_FILE.with_name(f"{_EMBEDDINGS_CACHE_FILE.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("wb") as f:
+            np.savez(f, key=np.array(cache_key), embeddings=embeddings)
+        os.replace(tmp_path, _EMBEDDINGS_CACHE_FILE)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        _logger.warning("Could not write embeddings cache", exc_info=True)
 
 
 # ---------------------------------------------------------------------------
-# Guide indexing (runs once at module load)
+# Guide indexing (runs once, on first use)
 # ---------------------------------------------------------------------------
 
+# Guide parsing patterns, compiled once
+_RE_PAREN = re.compile(r"\(([^)]+)\)")
+_RE_DB_SUFFIX = re.compile(r"\s*(Database|DB)\s*$", re.IGNORECASE)
+_RE_SPLIT = re.compile(r"[_\s/]+")
+_RE_WORDS = re.compile(r"[A-Za-z]+")
+_RE_QUOTED = re.compile(r"'([^']+)'")
+_RE_BACKTICK = re.compile(r"`([^`]+)`")
+# Search term tokenizer
+_RE_TOKEN_SPLIT = re.compile(r"[\s,_/]+")
+
+# Words too generic to identify a guide
+_STOP_WORDS = frozenset({
+    "the", "and", "for", "are", "but", "not", "you", "all",
+    "can", "her", "was", "one", "our", "out", "has", "its",
+    "with", "from", "this", "that", "these", "those", "data",
+    "rules", "standards", "guidelines", "database", "analytics",
+    "metrics", "conventions", "must", "should", "when",
+})
+
+
 class _GuideEntry:
     """Index entry for a single guide file."""
 
     __slots__ = (
         "path", "title", "schema_hint", "keywords",
         "content", "summary",
+        "title_lower", "schema_hint_lower", "stem_lower", "idx",
     )
 
-    def __init__(self, path: Path) -> None:
+    def __init__(self, path: Path, idx: int) -> None:
         self.path = path
-        self.content = path.read_text(encoding="utf-8")
+        # Position in the guide index
+        self.idx = idx
+        self.content = ""
         self.title = ""
         self.schema_hint = ""
         self.keywords: set[str] = set()
         self.summary = ""
+        # Lowercased copies used by Stage 1 scoring
+        self.title_lower = ""
+        self.schema_hint_lower = ""
+        self.stem_lower = path.stem.lower()
         self._parse()
 
     def _parse(self) -> None:
-        """Extract title, schema hint, keywords, and summary."""
-        lines = self.content.split("\n")
-
-        # Title: first H1 line
-        for line in lines:
-            if line.startswith("# "):
-                self.title = line[2:].strip()
-                break
+        """Read the guide and extract title, schema hint, keywords, and summary.
+
+        The file is streamed once, recording the title (first H1 line) and
+        H2 headers as it goes; the raw lines are joined once for the content.
+        """
+        raw_lines: list[str] = []
+        h2_headers: list[str] = []
+        found_title = False
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                raw_lines.append(line)
+                # One prefix test rejects the (vast majority of) body lines
+                if not line.startswith(("# ", "## ")):
+                    continue
+                if line[1] == "#":
+                    h2_headers.append(line[3:].strip())
+                elif not found_title:
+                    self.title = line[2:].strip()
+                    found_title = True
+        self.content = "".join(raw_lines)
+        self.title_lower = self.title.lower()
 
         # Schema hint: parenthetical in the title
-        paren_match = re.search(r"\(([^)]+)\)", self.title)
+        paren_match = _RE_PAREN.search(self.title)
         if paren_match:
             inner = paren_match.group(1)
-            schema_raw = re.sub(
-                r"\s*(Database|DB)\s*$", "", inner,
-                flags=re.IGNORECASE,
-            ).strip()
+            schema_raw = _RE_DB_SUFFIX.sub("", inner).strip()
             self.schema_hint = schema_raw
+            self.schema_hint_lower = schema_raw.lower()
 
         # Summary: title + all H2 headers (used for embedding)
-        h2_headers = [
-            line[3:].strip()
-            for line in lines
-            if line.startswith("## ")
-        ]
         self.summary = self.title + ". " + ". ".join(h2_headers)
 
         # Build keyword set from multiple sources
         kw: set[str] = set()
 
         # 1. File name stem tokens
-        for token in self.path.stem.split("_"):
+        for token in self.stem_lower.split("_"):
             if len(token) >= 2:
-                kw.add(token.lower())
+                kw.add(token)
 
         # 2. Schema hint tokens
         if self.schema_hint:
-            kw.add(self.schema_hint.lower())
-            for part in re.split(r"[_\s/]+", self.schema_hint):
+            kw.add(self.schema_hint_lower)
+            for part in _RE_SPLIT.split(self.schema_hint_lower):
                 if len(part) >= 2:
-                    kw.add(part.lower())
+                    kw.add(part)
 
         # 3. Title tokens (minus stop words)
-        stop_words = {
-            "the", "and", "for", "are", "but", "not", "you", "all",
-            "can", "her", "was", "one", "our", "out", "has", "its",
-            "with", "from", "this", "that", "these", "those", "data",
-            "rules", "standards", "guidelines", "database", "analytics",
-            "metrics", "conventions", "must", "should", "when",
-        }
-        for word in re.findall(r"[A-Za-z]+", self.title):
+        for word in _RE_WORDS.findall(self.title):
             w = word.lower()
-            if len(w) >= 2 and w not in stop_words:
+            if len(w) >= 2 and w not in _STOP_WORDS:
                 kw.add(w)
 
         # 4. H2 header tokens
-        for line in lines:
-            if line.startswith("## "):
-                for word in re.findall(r"[A-Za-z]+", line[3:]):
-                    w = word.lower()
-                    if len(w) >= 3 and w not in stop_words:
-                        kw.add(w)
+        for header in h2_headers:
+            for word in _RE_WORDS.findall(header):
+                w = word.lower()
+                if len(w) >= 3 and w not in _STOP_WORDS:
+                    kw.add(w)
 
         # 5. Quoted terms and backtick terms from content body
-        for match in re.findall(r"'([^']+)'", self.content):
+        for match in _RE_QUOTED.findall(self.content):
             if len(match) <= 20:
                 kw.add(match.lower())
-        for match in re.findall(r"`([^`]+)`", self.content):
+        for match in _RE_BACKTICK.findall(self.content):
             if len(match) <= 30:
                 kw.add(match.lower())
 
-        self.keywords = kw
+        # Interned, so keyword lookups with interned search tokens can
+        # match on identity before comparing characters
+        self.keywords = {sys.intern(k) for k in kw}
 
 
 def _build_index() -> list[_GuideEntry]:
     """Build the index over all guide files."""
     entries: list[_GuideEntry] = []
     if GUIDES_DIR.exists():
-        for md_file in sorted(GUIDES_DIR.glob("*.md")):
-            entries.append(_GuideEntry(md_file))
+        for idx, md_file in enumerate(sorted(GUIDES_DIR.glob("*.md"))):
+            entries.append(_GuideEntry(md_file, idx))
     return entries
 
 
-# Module-level index (built once at import)
-_GUIDE_INDEX: list[_GuideEntry] = _build_index()
+def _build_keyword_index(entries: list[_GuideEntry]) -> dict[str, frozenset[int]]:
+    """Build an inverted index mapping each keyword to the guides that have it."""
+    index: dict[str, set[int]] = {}
+    for idx, entry in enumerate(entries):
+        for kw in entry.keywords:
+            index.setdefault(kw, set()).add(idx)
+    return {kw: frozenset(guides) for kw, guides in index.items()}
+
+
+class _KeywordMatcher:
+    """Finds the keywords that contain, or are contained in, a search token.
+
+    Keywords inside the token are found in a single pass with an Aho-Corasick
+    automaton; keywords containing the token are found with ``str.find`` over
+    the vocabulary joined into one string. Both run in C. If the optional
+    ``pyahocorasick`` package is not installed, each keyword is checked in turn.
+    """
+
+    _SEP = "\x00"
+
+    def __init__(self, guides_by_keyword: dict[str, frozenset[int]]) -> None:
+        # Inverted keyword index: keyword -> indices of guides containing it
+        self.guides_by_keyword = guides_by_keyword
+        self.vocab: tuple[str, ...] = tuple(guides_by_keyword)
+        self._haystack = self._SEP.join(self.vocab)
+        # Start offset of each keyword within the haystack
+        self._offsets = list(accumulate((len(kw) + 1 for kw in self.vocab[:-1]), initial=0))
+        self._automaton = self._build_automaton(self.vocab)
+
+    @staticmethod
+    def _build_automaton(vocab: tuple[str, ...]):
+        try:
+            import ahocorasick  # ty: ignore[unresolved-import]
+        except ImportError:
+            return None
+        automaton = ahocorasick.Automaton()
+        for kw in vocab:
+            automaton.add_word(kw, kw)
+        if len(automaton) == 0:
+            return None
+        automaton.make_automaton()
+        return automaton
+
+    def matches(self, token: str) -> Iterator[str]:
+        """Yield keywords ``kw`` with ``token in kw or kw in token`` (may repeat)."""
+        if self._automaton is None or self._SEP in token:
+            for kw in self.vocab:
+                if token in kw or kw in token:
+                    yield kw
+            return
+
+        for _, kw in self._automaton.iter(token):
+            yield kw
+
+        # The separator never occurs in the token, so every hit lies within
+        # one keyword; resume the search at the start of the next keyword
+        pos = self._haystack.find(token)
+        while pos != -1:
+            i = bisect_right(self._offsets, pos) - 1
+            yield self.vocab[i]
+            pos = self._haystack.find(token, self._offsets[i] + len(self.vocab[i]) + 1)
+
+
+# Module-level guide index and keyword matcher (built on first use, so
+# importing the module does no file I/O)
+def _build_schema_index(entries: list[_GuideEntry]) -> dict[str, int]:
+    """Map lowercased schema hints to their guide, for the exact-match fast path.
+
+    Only hints that belong to a single guide and do not occur inside another
+    guide's hint are included: for those, a search term equal to the hint is
+    guaranteed to make that guide the unique Stage 1 winner.
+    """
+    hints = [entry.schema_hint_lower for entry in entries]
+    schema_to_idx: dict[str, int] = {}
+    for idx, hint in enumerate(hints):
+        if hint and not any(
+            hint in other for other_idx, other in enumerate(hints) if other_idx != idx
+        ):
+            schema_to_idx[hint] = idx
+    return schema_to_idx
+
+
+class _GuideIndex(NamedTuple):
+    """All lazily built guide retrieval state."""
+
+    entries: list[_GuideEntry]
+    matcher: _KeywordMatcher
+    schema_to_idx: dict[str, int]
+
+
+_index: _GuideIndex | None = None
+_index_lock = threading.Lock()
+
+
+def _load_index() -> _GuideIndex:
+    """Build the guide index and its lookup structures once, thread-safely."""
+    global _index  # noqa: PLW0603
+    index = _index
+    if index is None:
+        with _index_lock:
+            index = _index
+            if index is None:
+                entries = _build_index()
+                index = _index = _GuideIndex(
+                    entries=entries,
+                    matcher=_KeywordMatcher(_build_keyword_index(entries)),
+                    schema_to_idx=_build_schema_index(entries),
+                )
+    return index
+
+
+def _get_index() -> list[_GuideEntry]:
+    """Return all indexed guides, building the index on first access."""
+    return _load_index().entries
 
 
 # ---------------------------------------------------------------------------
 # Stage 1: Regex / keyword scoring
 # ---------------------------------------------------------------------------
 
-def _score_entry(entry: _GuideEntry, search_tokens: list[str]) -> float:
-    """Score a guide entry against search tokens. Higher is better."""
-    score = 0.0
+# A lowercased search token with the guides that have it as an exact keyword
+# and the guides with a keyword that contains it (or is contained in it)
+type _TokenMatch = tuple[str, frozenset[int], frozenset[int]]
+
 
-    for token in search_tokens:
-        tok_lower = token.lower()
+def _match_token(matcher: _KeywordMatcher, token: str) -> _TokenMatch:
+    """Resolve a lowercased search token against the keyword index.
 
+    Substring hits are found once over the distinct keywords, rather than
+    once per guide that contains them.
+    """
+    guides_by_keyword = matcher.guides_by_keyword
+    exact = guides_by_keyword.get(token, frozenset())
+    partial: set[int] = set()
+    for kw in matcher.matches(token):
+        partial.update(guides_by_keyword[kw])
+    return token, exact, frozenset(partial)
+
+
+def _score_entry(idx: int, entry: _GuideEntry, token_matches: list[_TokenMatch]) -> float:
+    """Score the guide ``entry`` (at ``idx``) against resolved search tokens.
+
+    Higher is better.
+    """
+    score = 0.0
+    schema_lower = entry.schema_hint_lower
+
+    for tok_lower, exact_guides, partial_guides in token_matches:
         # Exact schema hint match (highest priority)
-        if entry.schema_hint and tok_lower == entry.schema_hint.lower():
+        if schema_lower and tok_lower == schema_lower:
             score += 100.0
             continue
 
         # Schema hint substring
-        if entry.schema_hint and tok_lower in entry.schema_hint.lower():
+        if schema_lower and tok_lower in schema_lower:
             score += 50.0
             continue
 
         # Exact keyword match
-        if tok_lower in entry.keywords:
+        if idx in exact_guides:
             score += 10.0
             continue
 
         # Substring match in keywords
-        for kw in entry.keywords:
-            if tok_lower in kw or kw in tok_lower:
-                score += 5.0
-                break
+        if idx in partial_guides:
+            score += 5.0
 
         # Substring match in title
-        if tok_lower in entry.title.lower():
+        if tok_lower in entry.title_lower:
             score += 3.0
             continue
 
         # Substring match in file name
-        if tok_lower in entry.path.stem.lower():
+        if tok_lower in entry.stem_lower:
             score += 2.0
             continue
 
     return score
 
 
+def _tokenize(search_term: str) -> list[str]:
+    """Split a search term into tokens of at least two characters."""
+    search_tokens = [
+        t for t in _RE_TOKEN_SPLIT.split(search_term) if len(t) >= 2
+    ]
+    if not search_tokens:
+        search_tokens = [search_term.strip()]
+    return search_tokens
+
+
+@lru_cache(maxsize=512)
+def _stage1_scores(search_term: str) -> tuple[tuple[float, int], ...]:
+    """Return the top ``(score, guide index)`` pairs with a positive score, best first.
+
+    The guide index never changes once built, so results are cached per
+    search term and repeated queries skip tokenizing and scoring entirely.
+    """
+    entries, matcher, _ = _load_index()
+    search_tokens = _tokenize(search_term)
+    token_matches = [_match_token(matcher, sys.intern(t.lower())) for t in search_tokens]
+
+    scored: list[tuple[float, int]] = []
+    for idx, entry in enumerate(entries):
+        s = _score_entry(idx, entry, token_matches)
+        if s > 0:
+            scored.append((s, idx))
+    # Stable like a full sort: ties keep index order
+    return tuple(heapq.nlargest(_STAGE1_TOP_K, scored, key=itemgetter(0)))
+
+
 # ---------------------------------------------------------------------------
 # Stage 2: Semantic embedding similarity
 # ---------------------------------------------------------------------------
 
-def _semantic_search(query: str) -> tuple[_GuideEntry, float] | None:
+def _get_similarity_buffers(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return this thread's (int32 dot product, float32 similarity) buffers."""
+    buffers = getattr(_similarity_buffers, "buffers", None)
+    if buffers is None or len(buffers[0]) != n:
+        buffers = (np.empty(n, dtype=np.int32), np.empty(n, dtype=np.float32))
+        _similarity_buffers.buffers = buffers
+    return buffers
+
+
+def _semantic_search(
+    query: str, query_future: Future[np.ndarray | None] | None = None,
+) -> tuple[_GuideEntry, float] | None:
     """Find the best guide via cosine similarity of local embeddings.
 
+    Args:
+        query: The search term.
+        query_future: The query embedding, if it is already being computed
+            in the background.
+
     Returns the best entry and its similarity score, or None if
     embeddings are unavailable.
     """
-    if not _ensure_guide_embeddings() or _guide_embeddings is None:
+    if (
+        not _ensure_guide_embeddings()
+        or _guide_embeddings_i8 is None
+        or _guide_scales is None
+    ):
         return None
 
-    query_vec = _embed_texts([query])
+    query_vec = query_future.result() if query_future is not None else _embed_query(query)
     if query_vec is None:
         return None
 
-    # Cosine similarity (vectors are already L2-normalized)
-    similarities = _guide_embeddings @ query_vec[0]
+    # Cosine similarity (vectors are already L2-normalized), computed on the
+    # int8 copies and rescaled. Products are accumulated in int32: a 384-dim
+    # dot product of int8 values can exceed the int16 range.
+    q_i8, q_scale = _quantize_int8(query_vec)
+    dots, similarities = _get_similarity_buffers(len(_guide_scales))
+    np.matmul(_guide_embeddings_i8, q_i8, dtype=np.int32, out=dots)
+    np.divide(dots, _guide_scales, out=similarities)
+    similarities /= q_scale[0]
+
     best_idx = int(np.argmax(similarities))
     best_sim = float(similarities[best_idx])
 
     if best_sim >= _STAGE2_SIMILARITY_THRESHOLD:
-        return _GUIDE_INDEX[best_idx], best_sim
+        return _get_index()[best_idx], best_sim
     return None
 
 
@@ -393,11 +789,12 @@ def _semantic_search(query: str) -> tuple[_GuideEntry, float] | None:
 
 def _format_catalog() -> str:
     """Return a formatted listing of all available guides."""
+    index = _get_index()
     lines: list[str] = [
-        f"Available guides ({len(_GUIDE_INDEX)}):",
+        f"Available guides ({len(index)}):",
         "",
     ]
-    for entry in _GUIDE_INDEX:
+    for entry in index:
         hint = f"  (schema: {entry.schema_hint})" if entry.schema_hint else ""
         lines.append(f"  - {entry.path.stem}{hint}")
     lines.append("")
@@ -407,25 +804,27 @@ def _format_catalog() -> str:
 
 def _all_alternatives_for(
     selected: _GuideEntry,
-    scored: list[tuple[float, _GuideEntry]],
+    ranked: Sequence[tuple[float, int]],
 ) -> list[_GuideEntry]:
     """Collect candidate alternatives for the LLM validator."""
-    seen_paths: set[Path] = {selected.path}
+    index = _get_index()
+    # Bitmask of guide indices already taken
+    seen = 1 << selected.idx
     alts: list[_GuideEntry] = []
 
     # Start with scored entries (they have some keyword relevance)
-    for _, entry in scored:
-        if entry.path not in seen_paths:
-            alts.append(entry)
-            seen_paths.add(entry.path)
+    for _, idx in ranked:
+        if not seen >> idx & 1:
+            alts.append(index[idx])
+            seen |= 1 << idx
         if len(alts) >= 10:
             return alts
 
     # Pad with remaining guides from the full index
-    for entry in _GUIDE_INDEX:
-        if entry.path not in seen_paths:
+    for idx, entry in enumerate(index):
+        if not seen >> idx & 1:
             alts.append(entry)
-            seen_paths.add(entry.path)
+            seen |= 1 << idx
         if len(alts) >= 10:
             break
 
@@ -491,39 +890,37 @@ def get_business_rules(search_term: str) -> str:
         The full content of the best-matching guide (and optionally a second
         guide), or a list of available guides if no confident match is found.
     """
-    if not _GUIDE_INDEX:
+    index, _, schema_to_idx = _load_index()
+    if not index:
         return "No business rules guides found."
 
-    # Tokenize the search term
-    search_tokens = [
-        t for t in re.split(r"[\s,_/]+", search_term) if len(t) >= 2
-    ]
-    if not search_tokens:
-        search_tokens = [search_term.strip()]
+    # A lone token naming a guide's schema always clears the Stage 1
+    # threshold, so only start the Stage 2 query embedding (overlapping
+    # Stage 1) when it might actually be needed
+    search_tokens = _tokenize(search_term)
+    schema_hit = len(search_tokens) == 1 and search_tokens[0].lower() in schema_to_idx
+    query_future = None if schema_hit else _EMBED_POOL.submit(_embed_query, search_term)
 
     # ------------------------------------------------------------------
     # Stage 1: regex / keyword scoring + BM25 full-text
     # ------------------------------------------------------------------
-    scored: list[tuple[float, _GuideEntry]] = []
-    for entry in _GUIDE_INDEX:
-        s = _score_entry(entry, search_tokens)
-        if s > 0:
-            scored.append((s, entry))
-    scored.sort(key=lambda x: x[0], reverse=True)
+    ranked = _stage1_scores(search_term)
+    scored: list[tuple[float, _GuideEntry]] = [(s, index[idx]) for s, idx in ranked]
 
     if scored and scored[0][0] >= _STAGE1_CONFIDENCE_THRESHOLD:
+        # Stage 2 is not needed (no-op if the embedding already started)
+        if query_future is not None:
+            query_future.cancel()
         top_score, best = scored[0]
         # Stage 3: LLM validation (may swap to a better alternative)
-        best = _validate_guide_selection(
-            search_term, best, _all_alternatives_for(best, scored),
-        )
+        best = _validate_guide_selection(search_term, best, ranked)
 
         # Multi-guide: include runner-up when scores are close
         secondary: _GuideEntry | None = None
         if len(scored) >= 2:
             runner_score, runner = scored[1]
             if (
-                runner.path != best.path
+                runner is not best
                 and _should_include_second_guide(top_score, runner_score)
             ):
                 secondary = runner
@@ -532,8 +929,7 @@ def get_business_rules(search_term: str) -> str:
         close_alternatives = [
             e.title or e.path.stem
             for s, e in scored[2:5]
-            if s >= 5.0 and e.path != best.path
-            and (secondary is None or e.path != secondary.path)
+            if s >= 5.0 and e is not best and e is not secondary
         ]
 
         return _format_multi_guide_result(best, secondary, close_alternatives)
@@ -541,17 +937,15 @@ def get_business_rules(search_term: str) -> str:
     # ------------------------------------------------------------------
     # Stage 2: semantic embedding similarity
     # ------------------------------------------------------------------
-    semantic_result = _semantic_search(search_term)
+    semantic_result = _semantic_search(search_term, query_future)
     if semantic_result is not None:
         best_entry, similarity = semantic_result
         # Stage 3: LLM validation
-        best_entry = _validate_guide_selection(
-            search_term, best_entry, _all_alternatives_for(best_entry, scored),
-        )
+        best_entry = _validate_guide_selection(search_term, best_entry, ranked)
 
         # Mention the Stage 1 top candidate if it differs
         footer: list[str] = []
-        if scored and scored[0][1].path != best_entry.path:
+        if scored and scored[0][1] is not best_entry:
             footer.append(scored[0][1].title or scored[0][1].path.stem)
 
         return _format_multi_guide_result(best_entry, None, footer)
@@ -561,9 +955,7 @@ def get_business_rules(search_term: str) -> str:
     # ------------------------------------------------------------------
     if scored and scored[0][0] >= 10.0:
         best = scored[0][1]
-        best = _validate_guide_selection(
-            search_term, best, _all_alternatives_for(best, scored),
-        )
+        best = _validate_guide_selection(search_term, best, ranked)
         others = [
             e.title or e.path.stem
             for _, e in scored[1:4] if _ >= 5.0
@@ -572,9 +964,7 @@ def get_business_rules(search_term: str) -> str:
 
     if scored and scored[0][0] >= 2.0:
         best = scored[0][1]
-        best = _validate_guide_selection(
-            search_term, best, _all_alternatives_for(best, scored),
-        )
+        best = _validate_guide_selection(search_term, best, ranked)
         return (
             f"Best match (confidence: moderate):\n\n{best.content}\n\n"
             f"---\n{_format_catalog()}"
@@ -20,6 +20,8 @@ _logger = logging.getLogger(__name__)
 # Module-level config (set via configure())
 _api_key: str = ""
 _verifier_model: str = ""
+# Shared verifier, built once per configuration and reused across calls
+_verifier: Verifier | None = None
 
 
 def configure(api_key: str, verifier_model: str = "moonshotai/kimi-k2.5") -> None:
@@ -27,9 +29,14 @@ def configure(api_key: str, verifier_model: str = "moonshotai/kimi-k2.5") -> Non
 
     Call this once before the tool is used (e.g. in create_tools).
     """
-    global _api_key, _verifier_model  # noqa: PLW0603
+    global _api_key, _verifier_model, _verifier  # noqa: PLW0603
     _api_key = api_key
     _verifier_model = verifier_model
+    _verifier = (
+        Verifier(api_key=api_key, model=verifier_model)
+        if api_key and verifier_model
+        else None
+    )
 
 
 def check_sql(
@@ -60,14 +67,13 @@ def check_sql(
         "LGTM — no issues found." if the query looks correct, or a
         list of specific issues with suggested fixes if problems are found.
     """
-    if not _api_key or not _verifier_model:
+    if _verifier is None:
         return (
             "check_sql is not configured. "
             "Proceed with submit_answer if you are confident in your query."
         )
 
-    verifier = Verifier(api_key=_api_key, model=_verifier_model)
-    result = verifier.verify(
+    result = _verifier.verify(
         question=question,
         submitted_sql=sql,
         business_rules=business_rules,
@@ -5,7 +5,7 @@ and formatted output including row limits to prevent token explosion.
 """
 
 from framework.agent import Tool
-from framework.database import execute_query, validate_query
+from framework.database import execute_query_preview, format_rows, validate_query
 
 MAX_DISPLAY_ROWS = 50
 
@@ -27,8 +27,8 @@ def execute_sql(query: str) -> str:
             "Please fix the query and try again."
         )
 
-    # Step 2: Execute against DuckDB
-    result = execute_query(query)
+    # Step 2: Execute against DuckDB (only the displayed rows are kept)
+    result = execute_query_preview(query, MAX_DISPLAY_ROWS)
     if not result.is_success:
         return (
             f"EXECUTION ERROR: {result.error_message}\n"
@@ -40,11 +40,11 @@ def execute_sql(query: str) -> str:
     if df is None:
         return "Query executed successfully but returned no dataframe."
 
-    if df.is_empty():
+    total_rows = result.total_rows
+    if total_rows == 0:
         col_info = ", ".join(df.columns)
         return f"Query returned 0 rows.\nColumns: {col_info}"
 
-    total_rows = df.height
     total_cols = df.width
 
     # Build header
@@ -53,8 +53,8 @@ def execute_sql(query: str) -> str:
         "",
     ]
 
-    # Display up to MAX_DISPLAY_ROWS
-    display_df = df.head(MAX_DISPLAY_ROWS)
+    # Display up to MAX_DISPLAY_ROWS (already truncated by the preview)
+    display_df = df
 
     # Column headers
     col_names = display_df.columns
@@ -64,9 +64,7 @@ def execute_sql(query: str) -> str:
     lines.append(separator)
 
     # Data rows
-    for row in display_df.rows():
-        row_str = " | ".join(str(v) if v is not None else "NULL" for v in row)
-        lines.append(row_str)
+    lines.extend(format_rows(display_df))
 
     if total_rows > MAX_DISPLAY_ROWS:
         lines.append(f"... ({total_rows - MAX_DISPLAY_ROWS} more rows not shown)")
@@ -6,18 +6,87 @@ SQL generation to a specialized model for better accuracy.
 
 from __future__ import annotations
 
+import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any
+
+from sqlglot.errors import SqlglotError
 
 from framework.agent import Tool
-from framework.llm import completion_request
+from framework.database import validate_query
+from framework.llm import cache_control_content, completion_request
+from framework.llm_cache import LLMCache
 
 _logger = logging.getLogger(__name__)
 
+# Static instructions, sent first and marked as a prompt-cache breakpoint so
+# providers can reuse them across calls
+_SYSTEM_PROMPT = (
+    "You are a DuckDB SQL expert. Generate a single SQL query that answers "
+    "the user's question. Use schema-qualified table names (Schema.Table). "
+    'Respond ONLY with a JSON object of the form {"sql": "<query>"} — no '
+    "explanation, no markdown fences.\n\n"
+    "RULES — YOU MUST FOLLOW ALL OF THESE:\n\n"
+    "1. BUSINESS RULES APPLICATION: When business rules are provided, "
+    "translate EVERY applicable rule into SQL:\n"
+    "   - Exclusion rules → WHERE filters (e.g. WHERE status NOT IN ('X'))\n"
+    "   - Classification mappings → CASE WHEN col = 'A' THEN 'Label' END\n"
+    "   - Completed-only rules → WHERE completed_col IS NOT NULL\n"
+    "   - External-factor exclusions → WHERE factor_col IS NULL OR factor_col = 0\n"
+    "   - Threshold rules → use the exact column and threshold from the rules\n"
+    "   - Date-cutoff rules → WHERE date_col >= 'YYYY-01-01'\n"
+    "   - Min-threshold on aggregates → HAVING SUM/COUNT >= N\n"
+    "   - Subtraction rules → SUM(CASE WHEN type='refund' THEN -amt ELSE amt END)\n\n"
+    "2. COLUMN NAMES: Use ONLY exact column names from the schema. "
+    "Never guess. If similar-sounding columns exist, choose the one "
+    "that matches the rule's intent.\n\n"
+    "3. NUMERIC PRECISION:\n"
+    "   - Do NOT add ROUND() unless the question says 'round to N places'\n"
+    "   - Return fractions (0.0–1.0) unless the question says 'percentage'\n"
+    "   - Use CAST(x AS REAL) or x * 1.0 for float division when needed\n\n"
+    "4. FILTERS:\n"
+    "   - Do NOT add WHERE col IS NOT NULL unless explicitly required\n"
+    "   - Do NOT add extra filters beyond what the question and rules say\n\n"
+    "5. OUTPUT:\n"
+    "   - Keep name fields as separate columns (do not concatenate)\n"
+    "   - Include ALL columns the question asks for\n"
+    "   - Add ORDER BY only when the question implies ranking/top-N\n"
+    "   - Use HAVING for aggregate thresholds, WHERE for row-level\n"
+)
+
+# Fenced ```sql ... ``` (or bare ```) block in a model response
+_SQL_BLOCK_RE = re.compile(r"```(?:sql)?\s*\n(.*?)```", re.DOTALL | re.IGNORECASE)
+# Outermost {...} in a response, so JSON wrapped in prose or fences still parses
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Structured output: the model answers {"sql": "..."} instead of free text
+_SQL_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "sql_answer",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {"sql": {"type": "string"}},
+            "required": ["sql"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# Sampling temperatures for concurrent candidates; the first is the one used
+# for a single call
+_CANDIDATE_TEMPERATURES = (0.2, 0.0, 0.5)
+
 # Module-level config (set by create_tools)
 _api_key: str = ""
 _nl2sql_model: str = ""
 
+# Syntactically valid SQL from first attempts, keyed on the model and full request
+_sql_cache = LLMCache()
+
 
 def configure(api_key: str, nl2sql_model: str) -> None:
     """Configure the generate_sql tool with API key and model.
@@ -33,22 +102,91 @@ def _extract_sql_from_response(text: str) -> str:
     """Extract SQL from model response, handling markdown code blocks."""
     text = text.strip()
     # Try to find ```sql ... ``` or ``` ... ```
-    match = re.search(r"```(?:sql)?\s*\n(.*?)```", text, re.DOTALL | re.IGNORECASE)
+    match = _SQL_BLOCK_RE.search(text)
     if match:
         return match.group(1).strip()
-    # If no block, assume the whole response is SQL (trim common prefixes)
-    for prefix in ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE"):
-        if text.upper().startswith(prefix):
-            return text
+    # If no block, assume the whole response is SQL
     return text
 
 
+def _parse_sql_response(text: str) -> str:
+    """Read the SQL from a ``{"sql": ...}`` response, falling back to free text.
+
+    Providers that ignore ``response_format`` may still wrap the JSON in a
+    fence, or reply with plain (possibly fenced) SQL, which goes through
+    ``_extract_sql_from_response``.
+    """
+    match = _JSON_OBJECT_RE.search(text)
+    try:
+        sql = json.loads(match.group(0))["sql"] if match else None
+    except (ValueError, KeyError, TypeError):
+        sql = None
+    if not isinstance(sql, str):
+        return _extract_sql_from_response(text)
+    return sql.strip()
+
+
+def _is_valid_sql(sql: str) -> bool:
+    """Return True if *sql* parses; tokenizer errors count as invalid too."""
+    try:
+        return validate_query(sql).is_valid
+    except SqlglotError:
+        return False
+
+
+def _request_sql(messages: list[dict[str, Any]], temperature: float) -> str:
+    """Ask the NL2SQL model for one SQL query."""
+    response = completion_request(
+        api_key=_api_key,
+        model=_nl2sql_model,
+        messages=messages,
+        temperature=temperature,
+        response_format=_SQL_RESPONSE_FORMAT,
+    )
+    return _parse_sql_response(response)
+
+
+def _first_valid_candidate(messages: list[dict[str, Any]], num_candidates: int) -> str:
+    """Request several candidates concurrently and return the first valid one.
+
+    Candidates are sampled at different temperatures. The first response that
+    parses as SQL wins; if none parses, the first non-empty response is
+    returned so the caller still sees the error. All requests start at once,
+    so the losing ones still run to completion (and are billed) in the
+    background.
+    """
+    executor = ThreadPoolExecutor(max_workers=num_candidates, thread_name_prefix="nl2sql")
+    try:
+        futures = [
+            executor.submit(_request_sql, messages, temperature)
+            for temperature in _CANDIDATE_TEMPERATURES[:num_candidates]
+        ]
+        fallback = ""
+        last_error: Exception | None = None
+        for future in as_completed(futures):
+            try:
+                sql = future.result()
+            except Exception as e:
+                last_error = e
+                continue
+            if sql and _is_valid_sql(sql):
+                return sql
+            fallback = fallback or sql
+        if not fallback and last_error is not None:
+            raise last_error
+        return fallback
+    finally:
+        # Don't wait for requests still in flight once a winner is found
+        executor.shutdown(wait=False)
+
+
 def generate_sql(
     question: str,
     schema_info: str = "",
     business_rules: str = "",
     previous_sql: str = "",
     error_message: str = "",
+    num_candidates: int = 1,
 ) -> str:
     """Generate a SQL query for the given question using the NL2SQL model.
 
@@ -58,6 +196,8 @@ def generate_sql(
         business_rules: Relevant business rules from get_business_rules.
         previous_sql: Previous SQL attempt (for retries).
         error_message: Error from execute_sql (for retries).
+        num_candidates: Number of candidates to request concurrently (1-3);
+            the first syntactically valid one is returned.
 
     Returns:
         The generated SQL query, or an error message if generation fails.
@@ -68,45 +208,14 @@ def generate_sql(
             "Use execute_sql with your own SQL instead."
         )
 
-    system_prompt = (
-        "You are a DuckDB SQL expert. Generate a single SQL query that answers "
-        "the user's question. Use schema-qualified table names (Schema.Table). "
-        "Return ONLY the SQL query — no explanation, no markdown fences.\n\n"
-        "RULES — YOU MUST FOLLOW ALL OF THESE:\n\n"
-        "1. BUSINESS RULES APPLICATION: When business rules are provided, "
-        "translate EVERY applicable rule into SQL:\n"
-        "   - Exclusion rules → WHERE filters (e.g. WHERE status NOT IN ('X'))\n"
-        "   - Classification mappings → CASE WHEN col = 'A' THEN 'Label' END\n"
-        "   - Completed-only rules → WHERE completed_col IS NOT NULL\n"
-        "   - External-factor exclusions → WHERE factor_col IS NULL OR factor_col = 0\n"
-        "   - Threshold rules → use the exact column and threshold from the rules\n"
-        "   - Date-cutoff rules → WHERE date_col >= 'YYYY-01-01'\n"
-        "   - Min-threshold on aggregates → HAVING SUM/COUNT >= N\n"
-        "   - Subtraction rules → SUM(CASE WHEN type='refund' THEN -amt ELSE amt END)\n\n"
-        "2. COLUMN NAMES: Use ONLY exact column names from the schema. "
-        "Never guess. If similar-sounding columns exist, choose the one "
-        "that matches the rule's intent.\n\n"
-        "3. NUMERIC PRECISION:\n"
-        "   - Do NOT add ROUND() unless the question says 'round to N places'\n"
-        "   - Return fractions (0.0–1.0) unless the question says 'percentage'\n"
-        "   - Use CAST(x AS REAL) or x * 1.0 for float division when needed\n\n"
-        "4. FILTERS:\n"
-        "   - Do NOT add WHERE col IS NOT NULL unless explicitly required\n"
-        "   - Do NOT add extra filters beyond what the question and rules say\n\n"
-        "5. OUTPUT:\n"
-        "   - Keep name fields as separate columns (do not concatenate)\n"
-        "   - Include ALL columns the question asks for\n"
-        "   - Add ORDER BY only when the question implies ranking/top-N\n"
-        "   - Use HAVING for aggregate thresholds, WHERE for row-level\n"
-    )
-
     user_parts: list[str] = [f"Question: {question}"]
 
     if schema_info:
         user_parts.append(f"\nSchema:\n{schema_info}")
     if business_rules:
         user_parts.append(f"\nBusiness rules (MUST apply):\n{business_rules}")
-    if previous_sql and error_message:
+    is_retry = bool(previous_sql and error_message)
+    if is_retry:
         user_parts.append(
             f"\nPrevious attempt failed:\nSQL: {previous_sql}\nError: {error_message}\n"
             "Fix the SQL and return the corrected query."
@@ -115,20 +224,26 @@ def generate_sql(
     user_content = "\n".join(user_parts)
 
     messages = [
-        {"role": "system", "content": system_prompt},
+        {"role": "system", "content": cache_control_content(_SYSTEM_PROMPT)},
         {"role": "user", "content": user_content},
     ]
 
+    # Retries must reach the model: the cached answer is the one that failed
+    cache_key = None if is_retry else LLMCache.make_key(_nl2sql_model, messages)
+    if cache_key is not None and (cached := _sql_cache.get(cache_key)) is not None:
+        return cached
+
+    num_candidates = max(1, min(num_candidates, len(_CANDIDATE_TEMPERATURES)))
     try:
-        response = completion_request(
-            api_key=_api_key,
-            model=_nl2sql_model,
-            messages=messages,
-            temperature=0.2,
-        )
-        sql = _extract_sql_from_response(response)
+        if num_candidates == 1:
+            sql = _request_sql(messages, _CANDIDATE_TEMPERATURES[0])
+        else:
+            sql = _first_valid_candidate(messages, num_candidates)
         if not sql:
             return "Error: Model returned empty SQL."
+        # Never replay SQL that doesn't even parse
+        if cache_key is not None and _is_valid_sql(sql):
+            _sql_cache.set(cache_key, sql)
         return sql
     except Exception as e:
         _logger.warning("generate_sql failed: %s", e, exc_info=True)
@@ -180,6 +295,15 @@ def create_generate_sql_tool() -> Tool:
                     "description": "Error from execute_sql (for retries).",
                     "default": "",
                 },
+                "num_candidates": {
+                    "type": "integer",
+                    "description": (
+                        "Number of SQL candidates to generate in parallel (1-3). "
+                        "The first syntactically valid one is returned; every "
+                        "candidate is a full, billed model call."
+                    ),
+                    "default": 1,
+                },
             },
             "required": ["question"],
         },
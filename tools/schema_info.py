@@ -5,18 +5,16 @@ Provides two tools:
 - describe_table: Shows column details and sample data for a specific table
 """
 
+from functools import lru_cache
+
 from framework.agent import Tool
 from framework.database import (
     describe_table as db_describe_table,
 )
 from framework.database import (
     execute_query,
-)
-from framework.database import (
-    list_schemas as db_list_schemas,
-)
-from framework.database import (
-    list_tables as db_list_tables,
+    format_rows,
+    list_tables_by_schema,
 )
 
 
@@ -26,14 +24,14 @@ def list_schemas() -> str:
     Returns:
         Formatted string showing each schema and its tables.
     """
-    schemas = db_list_schemas()
-    if not schemas:
+    # One information_schema scan instead of a query per schema
+    tables_by_schema = list_tables_by_schema()
+    if not tables_by_schema:
         return "No schemas found in the database."
 
-    lines: list[str] = [f"Available schemas ({len(schemas)} total):", ""]
+    lines: list[str] = [f"Available schemas ({len(tables_by_schema)} total):", ""]
 
-    for schema in schemas:
-        tables = db_list_tables(schema)
+    for schema, tables in tables_by_schema.items():
         if tables:
             table_list = ", ".join(tables)
             lines.append(f"  {schema}: {table_list}")
@@ -43,19 +41,27 @@ def list_schemas() -> str:
     return "\n".join(lines)
 
 
-def describe_table(schema_name: str, table_name: str) -> str:
-    """Describe a table's columns and show sample data.
-
-    Args:
-        schema_name: Name of the schema (e.g., 'Airline').
-        table_name: Name of the table (e.g., 'On_Time_On_Time_Performance_2016_1').
+class _DescribeTableError(Exception):
+    """A describe_table result that must not be cached.
 
-    Returns:
-        Formatted string with column info and sample rows.
+    Raised for a missing table or a failed sample query; ``text`` is still
+    returned to the agent.
     """
+
+    def __init__(self, text: str) -> None:
+        super().__init__(text)
+        self.text = text
+
+
+# The database is opened read-only, so a complete description never changes.
+# Misses and partial results raise instead, which lru_cache does not store.
+@lru_cache(maxsize=128)
+def _describe_table_cached(schema_name: str, table_name: str) -> str:
     columns = db_describe_table(schema_name, table_name)
     if not columns:
-        return f"Table '{schema_name}.{table_name}' not found or has no columns."
+        raise _DescribeTableError(
+            f"Table '{schema_name}.{table_name}' not found or has no columns."
+        )
 
     lines: list[str] = [
         f"Table: {schema_name}.{table_name}",
@@ -68,23 +74,36 @@ def describe_table(schema_name: str, table_name: str) -> str:
     sample_result = execute_query(
         f'SELECT * FROM "{schema_name}"."{table_name}" LIMIT 3'
     )
-    if sample_result.is_success and sample_result.dataframe is not None:
-        df = sample_result.dataframe
-        if not df.is_empty():
-            lines.append("")
-            lines.append("Sample data (3 rows):")
-            col_names = df.columns
-            lines.append(" | ".join(col_names))
-            lines.append("-+-".join("-" * max(len(c), 8) for c in col_names))
-            for row in df.rows():
-                row_str = " | ".join(
-                    str(v) if v is not None else "NULL" for v in row
-                )
-                lines.append(row_str)
+    if not sample_result.is_success or sample_result.dataframe is None:
+        raise _DescribeTableError("\n".join(lines))
+    df = sample_result.dataframe
+    if not df.is_empty():
+        lines.append("")
+        lines.append("Sample data (3 rows):")
+        col_names = df.columns
+        lines.append(" | ".join(col_names))
+        lines.append("-+-".join("-" * max(len(c), 8) for c in col_names))
+        lines.extend(format_rows(df))
 
     return "\n".join(lines)
 
 
+def describe_table(schema_name: str, table_name: str) -> str:
+    """Describe a table's columns and show sample data.
+
+    Args:
+        schema_name: Name of the schema (e.g., 'Airline').
+        table_name: Name of the table (e.g., 'On_Time_On_Time_Performance_2016_1').
+
+    Returns:
+        Formatted string with column info and sample rows.
+    """
+    try:
+        return _describe_table_cached(schema_name, table_name)
+    except _DescribeTableError as e:
+        return e.text
+
+
 LIST_SCHEMAS: Tool = Tool(
     name="list_schemas",
     description=(
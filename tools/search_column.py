@@ -7,6 +7,11 @@ information_schema so no LLM call is needed.
 
 from __future__ import annotations
 
+import threading
+from itertools import groupby
+from operator import itemgetter
+from typing import NamedTuple
+
 from framework.agent import Tool
 from framework.database import DATABASE_PATH
 
@@ -15,6 +20,66 @@ import duckdb
 # Max columns to show in a single result to avoid flooding the context
 _MAX_RESULTS = 40
 
+# Fixed-width result line: schema, table, column, type, rank
+_ROW_FMT = "{:<22} {:<40} {:<35} {:<20} {}".format
+
+# Read-only connection shared by all calls (opening one reloads the catalog)
+_conn: duckdb.DuckDBPyConnection | None = None
+_conn_lock = threading.Lock()
+
+
+def _get_conn() -> duckdb.DuckDBPyConnection:
+    """Open the shared read-only connection on first use."""
+    global _conn  # noqa: PLW0603
+    if _conn is None:
+        with _conn_lock:
+            if _conn is None:
+                _conn = duckdb.connect(str(DATABASE_PATH), read_only=True)
+    return _conn
+
+
+class _TableColumns(NamedTuple):
+    """One table's entry in the column snapshot, with lowercased names."""
+
+    schema: str
+    table: str
+    schema_lower: str
+    table_lower: str
+    # (column, type, column_lower), sorted by column name
+    columns: list[tuple[str, str, str]]
+
+
+# Snapshot of information_schema.columns grouped by table, sorted by
+# (schema, table) and loaded on first search. The schema is static for the
+# session, so searches filter and rank it in Python.
+_tables: list[_TableColumns] | None = None
+_tables_lock = threading.Lock()
+
+
+def _get_tables() -> list[_TableColumns]:
+    """Load the column snapshot on first use."""
+    global _tables  # noqa: PLW0603
+    if _tables is None:
+        with _tables_lock:
+            if _tables is None:
+                with _get_conn().cursor() as cursor:
+                    rows = cursor.execute(
+                        "SELECT table_schema, table_name, column_name, data_type "
+                        "FROM information_schema.columns"
+                    ).fetchall()
+                rows.sort()
+                _tables = [
+                    _TableColumns(
+                        schema,
+                        table,
+                        schema.lower(),
+                        table.lower(),
+                        [(col, dtype, col.lower()) for _, _, col, dtype in group],
+                    )
+                    for (schema, table), group in groupby(rows, key=itemgetter(0, 1))
+                ]
+    return _tables
+
 
 def search_column(
     keyword: str,
@@ -48,54 +113,39 @@ def search_column(
     schema_filter = schema_name.strip()
     table_filter = table_name.strip()
 
-    clauses: list[str] = ["LOWER(column_name) LIKE LOWER(?)"]
-    params: list[str] = [f"%{keyword_clean}%"]
-    if schema_filter:
-        clauses.append("LOWER(table_schema) LIKE LOWER(?)")
-        params.append(f"%{schema_filter}%")
-    if table_filter:
-        clauses.append("LOWER(table_name) LIKE LOWER(?)")
-        params.append(f"%{table_filter}%")
+    try:
+        tables = _get_tables()
+    except Exception as e:
+        return f"Search failed: {e}"
 
-    where_sql = " AND ".join(clauses)
+    keyword_lower = keyword_clean.lower()
+    schema_lower = schema_filter.lower()
+    table_lower = table_filter.lower()
 
     # Rank by match quality to reduce noise:
     #   3 = exact column name match
     #   2 = prefix match
     #   1 = substring match
-    query = f"""
-SELECT
-    table_schema AS schema_name,
-    table_name,
-    column_name,
-    data_type,
-    CASE
-        WHEN LOWER(column_name) = LOWER(?) THEN 3
-        WHEN LOWER(column_name) LIKE LOWER(?) THEN 2
-        ELSE 1
-    END AS match_rank
-FROM information_schema.columns
-WHERE {where_sql}
-ORDER BY
-    match_rank DESC,
-    table_schema,
-    table_name,
-    column_name
-LIMIT {_MAX_RESULTS}
-"""
-
-    # Ranking params first, then WHERE params
-    query_params = [keyword_clean, f"{keyword_clean}%"] + params
-
-    conn: duckdb.DuckDBPyConnection | None = None
-    try:
-        conn = duckdb.connect(str(DATABASE_PATH), read_only=True)
-        rows = conn.execute(query, query_params).fetchall()
-    except Exception as e:
-        return f"Search failed: {e}"
-    finally:
-        if conn is not None:
-            conn.close()
+    # The snapshot is already in (schema, table, column) order, so each rank
+    # only needs its first _MAX_RESULTS matches and no sort is required.
+    by_rank: dict[int, list[tuple[str, str, str, str, int]]] = {3: [], 2: [], 1: []}
+    for entry in tables:
+        if schema_lower not in entry.schema_lower or table_lower not in entry.table_lower:
+            continue
+        for col, dtype, c_lower in entry.columns:
+            if keyword_lower not in c_lower:
+                continue
+            if c_lower == keyword_lower:
+                rank = 3
+            elif c_lower.startswith(keyword_lower):
+                rank = 2
+            else:
+                rank = 1
+            matches = by_rank[rank]
+            if len(matches) < _MAX_RESULTS:
+                matches.append((entry.schema, entry.table, col, dtype, rank))
+
+    rows = (by_rank[3] + by_rank[2] + by_rank[1])[:_MAX_RESULTS]
 
     if not rows:
         return (
@@ -107,15 +157,10 @@ LIMIT {_MAX_RESULTS}
         f"Columns matching '{keyword_clean}' "
         f"({len(rows)} result{'s' if len(rows) != 1 else ''}):",
         "",
-        f"{'Schema':<22} {'Table':<40} {'Column':<35} {'Type':<20} Rank",
+        _ROW_FMT("Schema", "Table", "Column", "Type", "Rank"),
         "-" * 130,
     ]
-
-    for row in rows:
-        schema, table, col, dtype, rank = row
-        lines.append(
-            f"{str(schema):<22} {str(table):<40} {str(col):<35} {str(dtype):<20} {rank}"
-        )
+    lines.extend(_ROW_FMT(*row) for row in rows)
 
     if len(rows) == _MAX_RESULTS:
         lines.append(f"\n(Results capped at {_MAX_RESULTS}. Use a more specific keyword.)")
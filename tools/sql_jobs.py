@@ -0,0 +1,132 @@
+"""Tools for running SQL queries in the background.
+
+``submit_sql_job`` starts a query on a worker thread and returns a job ID
+immediately, so the agent can keep working (e.g. look up business rules or
+describe tables) while a slow query runs. ``poll_sql_job`` returns the
+formatted result once the query has finished, in the same format as
+``execute_sql``.
+"""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from framework.agent import Tool
+from tools.execute_sql import execute_sql
+
+# Max seconds a single poll may block waiting for a job to finish
+_MAX_POLL_WAIT_SECONDS = 30.0
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="sql-job")
+_jobs: dict[str, Future[str]] = {}
+_jobs_lock = threading.Lock()
+
+
+def submit_sql_job(query: str) -> str:
+    """Start executing a SQL query in the background.
+
+    Args:
+        query: SQL query with schema-qualified table names.
+
+    Returns:
+        An acknowledgement containing the job ID to pass to poll_sql_job.
+    """
+    job_id = uuid.uuid4().hex[:8]
+    future = _executor.submit(execute_sql, query)
+    with _jobs_lock:
+        _jobs[job_id] = future
+    return (
+        f"Job {job_id} submitted. Continue with other work and call "
+        f"poll_sql_job(job_id='{job_id}') to get the results."
+    )
+
+
+def poll_sql_job(job_id: str, wait_seconds: float = 0.0) -> str:
+    """Return the result of a background SQL job, or its status if still running.
+
+    Args:
+        job_id: ID returned by submit_sql_job.
+        wait_seconds: How long to wait for the job to finish before reporting
+            that it is still running (capped at 30 seconds).
+
+    Returns:
+        The formatted query results (as execute_sql would return them), a
+        still-running status message, or an error for unknown job IDs. A
+        finished job is forgotten once its result has been returned.
+    """
+    job_id = job_id.strip()
+    with _jobs_lock:
+        future = _jobs.get(job_id)
+    if future is None:
+        return (
+            f"Unknown job ID '{job_id}' (results are returned only once). "
+            "Submit the query with submit_sql_job first."
+        )
+
+    timeout = min(max(wait_seconds, 0.0), _MAX_POLL_WAIT_SECONDS)
+    try:
+        result = future.result(timeout=timeout)
+    except FutureTimeoutError:
+        return f"Job {job_id} is still running. Poll again later."
+    except Exception as e:
+        result = f"Job {job_id} failed: {e}"
+    # The final result has been handed out; don't keep it alive for the session
+    with _jobs_lock:
+        _jobs.pop(job_id, None)
+    return result
+
+
+SUBMIT_SQL_JOB: Tool = Tool(
+    name="submit_sql_job",
+    description=(
+        "Start a potentially slow SQL query in the background and return a job ID "
+        "immediately. Use this instead of execute_sql for heavy queries so you can "
+        "keep exploring (business rules, schemas) while it runs, then fetch the "
+        "results with poll_sql_job. Table names must be schema-qualified."
+    ),
+    parameters={
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": (
+                    "The SQL query to execute. Must use schema-qualified table names "
+                    "(e.g., 'schema.table')."
+                ),
+            },
+        },
+        "required": ["query"],
+    },
+    function=submit_sql_job,
+)
+
+POLL_SQL_JOB: Tool = Tool(
+    name="poll_sql_job",
+    description=(
+        "Get the results of a query started with submit_sql_job. Returns the "
+        "same formatted output as execute_sql once the job has finished (each "
+        "result is returned only once), or a status message if it is still running."
+    ),
+    parameters={
+        "type": "object",
+        "properties": {
+            "job_id": {
+                "type": "string",
+                "description": "The job ID returned by submit_sql_job.",
+            },
+            "wait_seconds": {
+                "type": "number",
+                "description": (
+                    "Seconds to wait for the job to finish before returning "
+                    "(max 30). Use 0 to check without waiting."
+                ),
+                "default": 0,
+            },
+        },
+        "required": ["job_id"],
+    },
+    function=poll_sql_job,
+)